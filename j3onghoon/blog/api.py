@@ -0,0 +1,70 @@
+from rest_framework import routers, viewsets
+from rest_framework.pagination import CursorPagination
+
+from .filters import CategoryFilter, CommentFilter, PostFilter
+from .models import Category, Comment, Post
+from .serializers import CategorySerializer, CommentSerializer, PostSerializer
+
+
+class CreatedCursorPagination(CursorPagination):
+    ordering = "-created"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class SparseFieldsetViewSet(viewsets.ReadOnlyModelViewSet):
+    # ?fields= 로 요청된 필드에 필요한 컬럼만 SELECT 하고 관계도 필요한 것만 함께 읽음
+    pagination_class = CreatedCursorPagination
+    ordering_fields = ["created"]
+
+    def get_queryset(self):
+        serializer_class = self.get_serializer_class()
+        requested = serializer_class.get_requested_fields(self.request)
+        only, select_related, prefetch_related = serializer_class.get_query_plan(requested)
+        return self.queryset.only(*only, *select_related)\
+            .select_related(*select_related)\
+            .prefetch_related(*prefetch_related)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.prepare_page(page or [])
+        return page
+
+    def prepare_page(self, objects):
+        pass
+
+
+class PostViewSet(SparseFieldsetViewSet):
+    queryset = Post.objects.all()
+    serializer_class = PostSerializer
+    filterset_class = PostFilter
+    search_fields = ["title"]
+
+    def prepare_page(self, posts):
+        Category.fill_paths(post.category for post in posts if "category" in post._state.fields_cache)
+
+
+class CommentViewSet(SparseFieldsetViewSet):
+    # 소프트 삭제된 게시물의 댓글은 공개하지 않음
+    queryset = Comment.objects.filter(post__is_active=True)
+    serializer_class = CommentSerializer
+    filterset_class = CommentFilter
+
+
+class CategoryViewSet(SparseFieldsetViewSet):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    filterset_class = CategoryFilter
+    search_fields = ["name"]
+
+    def prepare_page(self, categories):
+        Category.fill_paths(categories)
+        if "image" in self.get_serializer_class().get_requested_fields(self.request):
+            Category.prefetch_attachments(categories)
+
+
+router = routers.DefaultRouter()
+router.register("posts", PostViewSet)
+router.register("comments", CommentViewSet)
+router.register("categories", CategoryViewSet)
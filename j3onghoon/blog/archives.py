@@ -0,0 +1,112 @@
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Category, Post
+
+
+class CountCache:
+    # 구간(bucket)별 개수를 키 하나씩 저장하고 incr 로 증감. 목록 키가 없으면 집계 쿼리 한 번으로 전체를 다시 계산
+    # 증감할 키가 캐시에서 빠져 있으면 목록 키를 지워 다음 조회 때 다시 계산하도록 함
+    def __init__(self, name, compute):
+        self.name = name
+        self.compute = compute
+
+    @property
+    def index_key(self):
+        return f"blog:counts:{self.name}"
+
+    def bucket_key(self, bucket):
+        return f"blog:counts:{self.name}:{bucket}"
+
+    def get_all(self):
+        buckets = cache.get(self.index_key)
+        if buckets is not None:
+            values = cache.get_many([self.bucket_key(bucket) for bucket in buckets])
+            if len(values) == len(buckets):
+                return {bucket: values[self.bucket_key(bucket)] for bucket in buckets}
+        return self.rebuild()
+
+    def get(self, bucket):
+        return self.get_all().get(bucket, 0)
+
+    def rebuild(self):
+        counts = dict(self.compute())
+        cache.set_many({self.bucket_key(bucket): count for bucket, count in counts.items()}, None)
+        cache.set(self.index_key, list(counts), None)
+        return counts
+
+    def adjust(self, deltas):
+        if cache.get(self.index_key) is None:
+            return
+        for bucket, delta in deltas.items():
+            if not delta:
+                continue
+            try:
+                cache.incr(self.bucket_key(bucket), delta)
+            except ValueError:
+                self.invalidate()
+                return
+
+    def invalidate(self):
+        cache.delete(self.index_key)
+
+
+def category_bucket(post_type, category_id):
+    return f"{post_type}:{category_id}"
+
+
+def month_bucket(post_type, year, month):
+    return f"{post_type}:{year:04d}-{month:02d}"
+
+
+def compute_category_counts():
+    # 카테고리 경로별 개수를 한 번에 집계한 뒤 경로의 모든 조상에 더해 하위 카테고리 포함 개수로 만듦
+    counts = Counter({category_bucket(post_type, pk): 0
+                      for pk in Category.all_objects.order_by().values_list("pk", flat=True)
+                      for post_type in Post.PostType.values})
+    rows = Post.objects.filter(category__isnull=False).order_by().values("category__path", "type")\
+        .annotate(count=Count("pk")).values_list("category__path", "type", "count")
+    for path, post_type, count in rows:
+        for category_id in path.split(Category.PATH_SEPARATOR)[:-1]:
+            counts[category_bucket(post_type, category_id)] += count
+    return counts
+
+
+def compute_month_counts():
+    rows = Post.objects.annotate(month=TruncMonth("created")).order_by().values("type", "month")\
+        .annotate(count=Count("pk")).values_list("type", "month", "count")
+    return {month_bucket(post_type, month.year, month.month): count for post_type, month, count in rows}
+
+
+category_post_counts = CountCache("category-posts", compute_category_counts)
+month_post_counts = CountCache("month-posts", compute_month_counts)
+
+
+def post_count_rows(pks, manager=None):
+    return list((manager or Post.objects).filter(pk__in=pks).values_list("type", "category__path", "created"))
+
+
+def adjust_post_counts(rows, sign):
+    category_deltas, month_deltas = Counter(), Counter()
+    for post_type, path, created in rows:
+        for category_id in (path or "").split(Category.PATH_SEPARATOR)[:-1]:
+            category_deltas[category_bucket(post_type, category_id)] += sign
+        created = timezone.localtime(created)
+        month_deltas[month_bucket(post_type, created.year, created.month)] += sign
+    category_post_counts.adjust(category_deltas)
+    month_post_counts.adjust(month_deltas)
+
+
+def archive_months(post_type):
+    # [(year, month, count), ...] 최신 월부터
+    prefix = f"{post_type}:"
+    months = [
+        (int(bucket[len(prefix):len(prefix) + 4]), int(bucket[-2:]), count)
+        for bucket, count in month_post_counts.get_all().items()
+        if bucket.startswith(prefix) and count > 0
+    ]
+    return sorted(months, reverse=True)
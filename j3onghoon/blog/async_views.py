@@ -0,0 +1,126 @@
+from django.core.paginator import InvalidPage
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.translation import gettext as _
+
+from .cache import acached_page_response, aget_generation
+from .comments import aload_comment_tree
+from .fragments import PROFILE_IMAGE_GENERATION, arender_comment_bodies, arender_post_rows, walk_comments
+from .models import User
+from .pagination import CachedCountPaginator, CursorPaginator, InvalidCursor
+from .views import GuestBookListView, PortfolioListView, PostDetailView, PostListView, post_view_counts
+
+
+# 동기 뷰와 같은 쿼리셋, 템플릿, 컨텍스트를 사용하되 ORM, 캐시 접근은 비동기 API 로 처리
+# ASGI 에서 스레드를 거치지 않으므로 경로별로 동기/비동기 뷰를 바꿔 쓸 수 있음
+class AsyncListMixin:
+    async def get(self, request, *args, **kwargs):
+        return await self.aconditional_get(request, lambda: acached_page_response(
+            self.post_type,
+            self.get_template_variant(),
+            self.get_cache_query(),
+            self.render_list,
+        ))
+
+    async def aget_validator_parts(self):
+        aggregate = await self.model.objects.filter(type=self.post_type).aaggregate(
+            count=Count("pk"), updated=Max("updated"),
+        )
+        return self.post_type, await aget_generation(self.post_type), aggregate["count"], aggregate["updated"]
+
+    async def aget_count_cache_key(self):
+        return f"blog:{self.post_type}:count:{self.get_scope()}:{await aget_generation(self.post_type)}"
+
+    async def apaginate_queryset(self, queryset, page_size):
+        count_cache_key = await self.aget_count_cache_key()
+        page_number = self.request.GET.get(self.page_kwarg)
+        if self.pagination_mode == "cursor" and not page_number:
+            paginator = CursorPaginator(queryset, page_size, count_cache_key=count_cache_key)
+            try:
+                page = await paginator.apage(self.request.GET.get("cursor"))
+            except InvalidCursor as e:
+                raise Http404(_("잘못된 페이지입니다: %(message)s") % {"message": str(e)})
+            if self.approximate_page_range:
+                await paginator.approximate_paginator.aprime_count()
+            return paginator, page
+
+        paginator = CachedCountPaginator(
+            queryset, page_size, count_cache_key=count_cache_key if self.pagination_mode == "cursor" else None,
+        )
+        await paginator.aprime_count()
+        try:
+            number = paginator.num_pages if page_number == "last" else paginator.validate_number(page_number or 1)
+        except InvalidPage as e:
+            raise Http404(_("잘못된 페이지입니다 (%(page_number)s): %(message)s") % {
+                "page_number": page_number, "message": str(e),
+            })
+        bottom = (number - 1) * paginator.per_page
+        objects = [obj async for obj in queryset[bottom:bottom + paginator.per_page]]
+        return paginator, paginator._get_page(objects, number, paginator)
+
+    async def render_list(self):
+        queryset = self.get_queryset()
+        paginator, page = await self.apaginate_queryset(queryset, self.paginate_by)
+        object_list = list(page.object_list)
+        await arender_post_rows(object_list)
+        await User.aprefetch_attachments((post.author for post in object_list), renditions=True)
+
+        cursor_pagination = isinstance(paginator, CursorPaginator)
+        elided_page_range = []
+        if not cursor_pagination or self.approximate_page_range:
+            elided_page_range = paginator.get_elided_page_range(number=page.number, on_each_side=2, on_ends=1)
+        context = {
+            "view": self,
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "object_list": object_list,
+            self.get_context_object_name(object_list): object_list,
+            "cursor_pagination": cursor_pagination,
+            "elided_page_range": elided_page_range,
+        }
+        return self.render_to_response(context).render()
+
+
+class AsyncPostListView(AsyncListMixin, PostListView):
+    pass
+
+
+class AsyncGuestBookListView(AsyncListMixin, GuestBookListView):
+    pass
+
+
+class AsyncPortfolioListView(AsyncListMixin, PortfolioListView):
+    pass
+
+
+class AsyncPostDetailView(PostDetailView):
+    async def get(self, request, *args, **kwargs):
+        response = await self.aconditional_get(request, lambda: self.render_detail(request, *args, **kwargs))
+        if self.count_views:
+            await post_view_counts.aincrement(self.kwargs["pk"], viewer=self.get_viewer())
+        return response
+
+    async def aget_validator_parts(self):
+        return self.make_validator_parts(await self.get_validator_queryset().afirst(),
+                                         await aget_generation(PROFILE_IMAGE_GENERATION))
+
+    async def render_detail(self, request, *args, **kwargs):
+        try:
+            self.object = await self.get_queryset().aget(pk=kwargs["pk"])
+        except self.model.DoesNotExist:
+            raise Http404(_("%(verbose_name)s 을(를) 찾을 수 없습니다.") % {
+                "verbose_name": self.model._meta.verbose_name,
+            })
+
+        comment_page = await aload_comment_tree(self.object, page=request.GET.get("comment_page"))
+        comments = await arender_comment_bodies(comment_page.object_list)
+        await User.aprefetch_attachments([self.object.author, *(comment.author for comment in walk_comments(comments))], renditions=True)
+        context = {
+            "view": self,
+            "object": self.object,
+            self.get_context_object_name(self.object): self.object,
+            "comment_page": comment_page,
+            "comments": comments,
+        }
+        return self.render_to_response(context).render()
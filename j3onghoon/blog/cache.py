@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+PAGE_CACHE_STALE_TIMEOUT = 60 * 60
+PAGE_CACHE_LOCK_TIMEOUT = 10
+PAGE_CACHE_WAIT_TIMEOUT = 2
+PAGE_CACHE_WAIT_INTERVAL = 0.05
+
+
+def generation_key(post_type):
+    return f"blog:{post_type}:generation"
+
+
+def get_generation(post_type):
+    # 캐시가 비워진 뒤에도 이전 세대 번호를 재사용하지 않도록 현재 시각으로 초기화
+    return cache.get_or_set(generation_key(post_type), time.time_ns, None)
+
+
+async def aget_generation(post_type):
+    return await cache.aget_or_set(generation_key(post_type), time.time_ns, None)
+
+
+def bump_generation(*post_types):
+    for post_type in set(post_types):
+        try:
+            cache.incr(generation_key(post_type))
+        except ValueError:
+            cache.set(generation_key(post_type), time.time_ns(), None)
+
+
+def page_cache_key(post_type, variant, query):
+    digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+    return f"blog:{post_type}:page:{variant}:{digest}"
+
+
+def _serialize(response, generation):
+    return {
+        "generation": generation,
+        # 다른 프로세스나 재시작 후에도 비교할 수 있도록 벽시계 시각으로 저장
+        "expires": time.time() + PAGE_CACHE_TIMEOUT,
+        "content": response.content,
+        "content_type": response["Content-Type"],
+    }
+
+
+def _deserialize(entry, stale=False):
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    # 이전 세대 페이지는 현재 검증자와 내용이 다르므로 ETag 를 붙이지 않도록 표시
+    response.is_stale_page = stale
+    return response
+
+
+def _fresh(entry, generation):
+    return entry is not None and entry["generation"] == generation and entry["expires"] > time.time()
+
+
+def cached_page_response(post_type, variant, query, build_response):
+    # 세대 번호가 바뀌거나 만료된 페이지는 락을 얻은 한 워커만 다시 생성하고
+    # 나머지 워커는 이전 페이지를 그대로 응답 (stampede 방지)
+    key = page_cache_key(post_type, variant, query)
+    generation = get_generation(post_type)
+    entry = cache.get(key)
+    if _fresh(entry, generation):
+        return _deserialize(entry)
+
+    lock_key = f"{key}:lock"
+    if not cache.add(lock_key, 1, PAGE_CACHE_LOCK_TIMEOUT):
+        if entry is not None:
+            return _deserialize(entry, stale=entry["generation"] != generation)
+
+        deadline = time.monotonic() + PAGE_CACHE_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(PAGE_CACHE_WAIT_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None and entry["generation"] == generation:
+                return _deserialize(entry)
+        return build_response()
+
+    try:
+        response = build_response()
+        if hasattr(response, "render") and callable(response.render):
+            response = response.render()
+        if response.status_code == 200:
+            cache.set(key, _serialize(response, generation), PAGE_CACHE_STALE_TIMEOUT)
+        return response
+    finally:
+        cache.delete(lock_key)
+
+
+async def acached_page_response(post_type, variant, query, build_response):
+    # cached_page_response 의 비동기 버전. build_response 는 코루틴 함수
+    key = page_cache_key(post_type, variant, query)
+    generation = await aget_generation(post_type)
+    entry = await cache.aget(key)
+    if _fresh(entry, generation):
+        return _deserialize(entry)
+
+    lock_key = f"{key}:lock"
+    if not await cache.aadd(lock_key, 1, PAGE_CACHE_LOCK_TIMEOUT):
+        if entry is not None:
+            return _deserialize(entry, stale=entry["generation"] != generation)
+
+        deadline = time.monotonic() + PAGE_CACHE_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(PAGE_CACHE_WAIT_INTERVAL)
+            entry = await cache.aget(key)
+            if entry is not None and entry["generation"] == generation:
+                return _deserialize(entry)
+        return await build_response()
+
+    try:
+        response = await build_response()
+        if response.status_code == 200:
+            await cache.aset(key, _serialize(response, generation), PAGE_CACHE_STALE_TIMEOUT)
+        return response
+    finally:
+        await cache.adelete(lock_key)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+# 프로세스마다 따로 저장되는 캐시 백엔드
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+    return [Warning(
+        "기본 캐시가 프로세스 간에 공유되지 않습니다.",
+        hint="워커가 여러 개이면 페이지 캐시 무효화와 재생성 락이 다른 워커에 적용되지 않습니다. "
+             "Redis, DB 캐시 등 공유 캐시를 사용하세요.",
+        id="blog.W001",
+    )]
@@ -0,0 +1,47 @@
+from django.core.paginator import Paginator
+
+from .models import Comment
+
+
+COMMENT_THREADS_PER_PAGE = 20
+COMMENT_MAX_DEPTH = 5
+COMMENT_REPLIES_PER_NODE = 10
+
+
+def build_comment_tree(comments, max_depth=COMMENT_MAX_DEPTH, replies_per_node=COMMENT_REPLIES_PER_NODE):
+    # created 순으로 정렬된 댓글 목록을 한 번 순회해 트리를 구성 (O(n))
+    # max_depth 보다 깊은 답글은 max_depth 위치의 조상 아래에 평평하게 붙이고,
+    # 답글이 replies_per_node 개를 넘으면 나머지는 접어서 개수만 남김
+    nodes = {}
+    roots = []
+    for comment in comments:
+        comment.replies = []
+        comment.hidden_replies = []
+        parent = nodes.get(comment.parent_id)
+        if parent is None:
+            comment.depth = 0
+            roots.append(comment)
+        else:
+            while parent.depth >= max_depth:
+                parent = nodes[parent.parent_id]
+            comment.depth = parent.depth + 1
+            if len(parent.replies) < replies_per_node:
+                parent.replies.append(comment)
+            else:
+                parent.hidden_replies.append(comment)
+        nodes[comment.pk] = comment
+    return roots
+
+
+def load_comment_tree(post, page=1, threads_per_page=COMMENT_THREADS_PER_PAGE, **kwargs):
+    # 활성 댓글 전체를 하나의 쿼리로 읽고 최상위 스레드 단위로 페이지를 나눔
+    # 부모가 삭제된 답글은 최상위 스레드로 취급
+    comments = Comment.objects.filter(post=post).select_related("author").order_by("created", "pk")
+    roots = build_comment_tree(comments, **kwargs)
+    return Paginator(roots, threads_per_page).get_page(page)
+
+
+async def aload_comment_tree(post, page=1, threads_per_page=COMMENT_THREADS_PER_PAGE, **kwargs):
+    comments = Comment.objects.filter(post=post).select_related("author").order_by("created", "pk")
+    roots = build_comment_tree([comment async for comment in comments], **kwargs)
+    return Paginator(roots, threads_per_page).get_page(page)
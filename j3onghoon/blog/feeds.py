@@ -0,0 +1,172 @@
+import hashlib
+import io
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date
+from django.utils.xmlutils import SimplerXMLGenerator
+from django.views import View
+
+from .cache import get_generation
+from .models import Post
+
+
+FEED_ITEMS = 50
+SITEMAP_SEGMENT_SIZE = 1000
+SITEMAP_CHUNK_SIZE = 500
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+SITEMAP_GENERATION = "sitemap"
+
+
+def sitemap_segment(pk):
+    return pk // SITEMAP_SEGMENT_SIZE
+
+
+def sitemap_segment_generation(segment):
+    return f"{SITEMAP_GENERATION}-{segment}"
+
+
+def stored_document(request, name, generation, build):
+    # 세대 번호가 같으면 미리 만들어 둔 문서를 그대로 사용하고, 바뀐 문서만 다시 생성
+    host = f"{request.scheme}://{request.get_host()}"
+    key = f"blog:document:{name}:{hashlib.md5(host.encode(), usedforsecurity=False).hexdigest()}"
+    entry = cache.get(key)
+    if entry is None or entry["generation"] != generation:
+        content, content_type, last_modified = build()
+        entry = {
+            "generation": generation,
+            "content": content,
+            "content_type": content_type,
+            "etag": quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest()),
+            "last_modified": last_modified and last_modified.timestamp(),
+        }
+        cache.set(key, entry, None)
+    return entry
+
+
+def document_response(request, entry):
+    response = get_conditional_response(request, etag=entry["etag"], last_modified=entry["last_modified"])
+    if response is None:
+        response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    response["ETag"] = entry["etag"]
+    if entry["last_modified"]:
+        response["Last-Modified"] = http_date(entry["last_modified"])
+    return response
+
+
+class PostFeedView(View):
+    feed_class = Atom1Feed
+
+    def get(self, request, post_type):
+        if post_type not in Post.PostType.values:
+            raise Http404
+        entry = stored_document(
+            request, f"feed:{self.feed_class.__name__}:{post_type}", get_generation(post_type),
+            lambda: self.build(post_type),
+        )
+        return document_response(request, entry)
+
+    def build(self, post_type):
+        label = Post.PostType(post_type).label
+        feed = self.feed_class(
+            title=str(label),
+            link=self.request.build_absolute_uri(reverse(f"{post_type}s")),
+            description=str(label),
+            feed_url=self.request.build_absolute_uri(),
+            language="ko",
+        )
+        posts = Post.objects.filter(type=post_type).order_by("-created", "-pk")\
+            .only("pk", "title", "excerpt", "created", "updated")[:FEED_ITEMS]
+        last_modified = None
+        for post in posts.iterator():
+            link = self.request.build_absolute_uri(reverse("post-detail", args=[post.pk]))
+            feed.add_item(
+                title=post.title,
+                link=link,
+                description=post.excerpt,
+                unique_id=link,
+                pubdate=post.created,
+                updateddate=post.updated,
+            )
+            last_modified = max(last_modified or post.updated, post.updated)
+
+        stream = io.StringIO()
+        feed.write(stream, "utf-8")
+        return stream.getvalue().encode(), feed.content_type, last_modified
+
+
+class RssPostFeedView(PostFeedView):
+    feed_class = Rss201rev2Feed
+
+
+def sitemap_segment_document(request, segment):
+    return stored_document(
+        request, f"sitemap:{segment}", get_generation(sitemap_segment_generation(segment)),
+        lambda: build_sitemap_segment(request, segment),
+    )
+
+
+def build_sitemap_segment(request, segment):
+    # pk 범위로 나눈 구간을 청크 단위로 읽으며 바로 XML 로 기록
+    start = segment * SITEMAP_SEGMENT_SIZE
+    rows = Post.objects.filter(pk__gte=start, pk__lt=start + SITEMAP_SEGMENT_SIZE)\
+        .order_by("pk").values_list("pk", "updated")
+    stream = io.StringIO()
+    xml = SimplerXMLGenerator(stream, "utf-8")
+    xml.startDocument()
+    xml.startElement("urlset", {"xmlns": SITEMAP_NAMESPACE})
+    last_modified = None
+    for pk, updated in rows.iterator(chunk_size=SITEMAP_CHUNK_SIZE):
+        xml.startElement("url", {})
+        xml.addQuickElement("loc", request.build_absolute_uri(reverse("post-detail", args=[pk])))
+        xml.addQuickElement("lastmod", updated.isoformat())
+        xml.endElement("url")
+        last_modified = max(last_modified or updated, updated)
+    xml.endElement("urlset")
+    xml.endDocument()
+    return stream.getvalue().encode(), "application/xml; charset=utf-8", last_modified
+
+
+class SitemapIndexView(View):
+    def get(self, request):
+        entry = stored_document(request, "sitemap-index", get_generation(SITEMAP_GENERATION), self.build)
+        return document_response(request, entry)
+
+    def build(self):
+        # 구간 문서를 차례로 확인해 바뀐 구간만 다시 만들고, 각 구간의 최근 수정 일시로 색인을 구성
+        bounds = Post.all_objects.aggregate(start=Min("pk"), end=Max("pk"))
+        segments = []
+        if bounds["start"] is not None:
+            segments = range(sitemap_segment(bounds["start"]), sitemap_segment(bounds["end"]) + 1)
+
+        stream = io.StringIO()
+        xml = SimplerXMLGenerator(stream, "utf-8")
+        xml.startDocument()
+        xml.startElement("sitemapindex", {"xmlns": SITEMAP_NAMESPACE})
+        last_modified = None
+        for segment in segments:
+            entry = sitemap_segment_document(self.request, segment)
+            if not entry["last_modified"]:
+                continue
+            xml.startElement("sitemap", {})
+            xml.addQuickElement("loc", self.request.build_absolute_uri(reverse("sitemap-segment", args=[segment])))
+            xml.addQuickElement("lastmod", datetime.fromtimestamp(entry["last_modified"], timezone.utc).isoformat())
+            xml.endElement("sitemap")
+            last_modified = max(last_modified or entry["last_modified"], entry["last_modified"])
+        xml.endElement("sitemapindex")
+        xml.endDocument()
+        last_modified = last_modified and datetime.fromtimestamp(last_modified, timezone.utc)
+        return stream.getvalue().encode(), "application/xml; charset=utf-8", last_modified
+
+
+class SitemapSegmentView(View):
+    def get(self, request, segment):
+        entry = sitemap_segment_document(request, segment)
+        if not entry["last_modified"]:
+            raise Http404
+        return document_response(request, entry)
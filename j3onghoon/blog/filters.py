@@ -0,0 +1,21 @@
+import django_filters
+
+from .models import Category, Comment, Post
+
+
+class PostFilter(django_filters.FilterSet):
+    class Meta:
+        model = Post
+        fields = ["type", "category"]
+
+
+class CommentFilter(django_filters.FilterSet):
+    class Meta:
+        model = Comment
+        fields = ["post", "parent"]
+
+
+class CategoryFilter(django_filters.FilterSet):
+    class Meta:
+        model = Category
+        fields = ["parent"]
@@ -0,0 +1,97 @@
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from .cache import aget_generation, get_generation
+from .models import Category
+
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+# 조각 템플릿을 바꾸면 올려서 이전 조각을 무효화
+FRAGMENT_VERSION = 2
+CATEGORY_GENERATION = "category"
+# 작성자 프로필 이미지는 조각 밖에서 그리지만 페이지 캐시와 ETag 는 이 세대 번호로 무효화
+PROFILE_IMAGE_GENERATION = "profile-image"
+
+
+def _stamp(instance):
+    if instance is None:
+        return "-"
+    return f"{instance.pk}.{instance.updated.timestamp():.6f}"
+
+
+def fragment_key(kind, instance, *dependencies):
+    # pk 와 updated 로 키를 만들어 수정된 객체의 조각만 새로 렌더링되도록 함
+    parts = ":".join(str(part) if isinstance(part, (int, str)) else _stamp(part) for part in dependencies)
+    return f"blog:fragment:v{FRAGMENT_VERSION}:{get_language()}:{kind}:{_stamp(instance)}:{parts}"
+
+
+def post_row_key(post, category_generation):
+    # 상위 카테고리 이름이 바뀌면 full_path 가 바뀌므로 카테고리 세대 번호를 함께 사용
+    # rerender_posts 는 updated 를 바꾸지 않으므로 렌더러 버전도 포함
+    return fragment_key("post-row", post, post.category, post.comments_count, post.render_version, category_generation)
+
+
+def comment_body_key(comment):
+    return fragment_key("comment", comment, comment.author)
+
+
+def _render_missing(instances, keys, cached, template_name, context_name, attr):
+    missing = {}
+    for instance in instances:
+        key = keys[instance.pk]
+        if key not in cached:
+            cached[key] = missing[key] = render_to_string(template_name, {context_name: instance})
+        setattr(instance, attr, mark_safe(cached[key]))
+    return missing
+
+
+def render_post_rows(posts):
+    # 페이지의 행 조각을 get_many 한 번으로 읽고, 없는 행만 카테고리 경로를 채워 렌더링
+    posts = list(posts)
+    category_generation = get_generation(CATEGORY_GENERATION)
+    keys = {post.pk: post_row_key(post, category_generation) for post in posts}
+    cached = cache.get_many(keys.values())
+    misses = [post for post in posts if keys[post.pk] not in cached]
+    Category.fill_paths(post.category for post in misses)
+    if missing := _render_missing(posts, keys, cached, "post_row.html", "post", "row_html"):
+        cache.set_many(missing, FRAGMENT_CACHE_TIMEOUT)
+    return posts
+
+
+async def arender_post_rows(posts):
+    posts = list(posts)
+    category_generation = await aget_generation(CATEGORY_GENERATION)
+    keys = {post.pk: post_row_key(post, category_generation) for post in posts}
+    cached = await cache.aget_many(keys.values())
+    misses = [post for post in posts if keys[post.pk] not in cached]
+    await Category.afill_paths(post.category for post in misses)
+    if missing := _render_missing(posts, keys, cached, "post_row.html", "post", "row_html"):
+        await cache.aset_many(missing, FRAGMENT_CACHE_TIMEOUT)
+    return posts
+
+
+def walk_comments(roots):
+    for comment in roots:
+        yield comment
+        yield from walk_comments(comment.replies)
+        yield from walk_comments(comment.hidden_replies)
+
+
+def render_comment_bodies(roots):
+    comments = list(walk_comments(roots))
+    keys = {comment.pk: comment_body_key(comment) for comment in comments}
+    cached = cache.get_many(keys.values())
+    if missing := _render_missing(comments, keys, cached, "comment_body.html", "comment", "body_html"):
+        cache.set_many(missing, FRAGMENT_CACHE_TIMEOUT)
+    return roots
+
+
+async def arender_comment_bodies(roots):
+    comments = list(walk_comments(roots))
+    keys = {comment.pk: comment_body_key(comment) for comment in comments}
+    cached = await cache.aget_many(keys.values())
+    if missing := _render_missing(comments, keys, cached, "comment_body.html", "comment", "body_html"):
+        await cache.aset_many(missing, FRAGMENT_CACHE_TIMEOUT)
+    return roots
@@ -0,0 +1,169 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from blog.models import Attachment, Category, Comment, Post
+
+
+# seed_blog 에 넘길 데이터 규모 프리셋
+DATA_SIZES = {
+    "small": {"users": 10, "category_depth": 2, "category_fanout": 3, "posts": 50, "comments": 5},
+    "medium": {"users": 50, "category_depth": 3, "category_fanout": 4, "posts": 500, "comments": 10},
+    "large": {"users": 200, "category_depth": 4, "category_fanout": 4, "posts": 5000, "comments": 10},
+}
+
+# <pk> 가 필요한 URL 이름별로 예시 객체를 가져올 모델
+SAMPLE_MODELS = {
+    "post-detail": Post,
+    "api:post-detail": Post,
+    "api:comment-detail": Comment,
+    "api:category-detail": Category,
+    "attachment-file": Attachment,
+}
+
+# <slug> 가 필요한 URL 이름별로 예시 객체를 가져올 모델
+SAMPLE_SLUG_MODELS = {
+    "category-posts": Category,
+}
+
+# 그 밖의 URL 인자에 사용할 값 (seed_blog 데이터 기준)
+SAMPLE_KWARGS = {"post_type": "post", "segment": 0, "year": 2024, "month": 1}
+
+EXCLUDED_NAMESPACES = {"admin"}
+# 로그인, 비밀번호 변경 등 인증 흐름은 측정 대상에서 제외
+EXCLUDED_MODULES = {"django.contrib.auth.urls"}
+
+
+def collect_url_names(resolver=None, namespace=None):
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            module = getattr(pattern.urlconf_name, "__name__", None)
+            if pattern.namespace in EXCLUDED_NAMESPACES or module in EXCLUDED_MODULES:
+                continue
+            child_namespace = pattern.namespace or namespace
+            if namespace and pattern.namespace:
+                child_namespace = f"{namespace}:{pattern.namespace}"
+            yield from collect_url_names(pattern, child_namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            # DRF 라우터의 .json 등 format 접미사 패턴은 같은 뷰이므로 건너뜀
+            if "format" in pattern.pattern.regex.groupindex:
+                continue
+            yield name, set(pattern.pattern.regex.groupindex)
+
+
+def url_targets(skipped=None):
+    # 측정할 (URL 이름, 경로). 채울 수 없는 인자가 있는 URL 은 skipped(name, kwargs) 로 알림
+    for name, kwargs in collect_url_names():
+        if not kwargs:
+            yield name, reverse(name)
+        elif kwargs == {"pk"} and name in SAMPLE_MODELS:
+            # 가장 최근 객체를 사용해 규모가 커져도 같은 위치의 데이터를 측정
+            pk = SAMPLE_MODELS[name].objects.order_by("-pk").values_list("pk", flat=True).first()
+            if pk is not None:
+                yield name, reverse(name, kwargs={"pk": pk})
+        elif kwargs == {"slug"} and name in SAMPLE_SLUG_MODELS:
+            # 루트 카테고리처럼 하위 항목이 가장 많은 객체를 사용
+            slug = SAMPLE_SLUG_MODELS[name].objects.order_by("path").values_list("slug", flat=True).first()
+            if slug is not None:
+                yield name, reverse(name, kwargs={"slug": slug})
+        elif kwargs <= SAMPLE_KWARGS.keys():
+            yield name, reverse(name, kwargs={key: SAMPLE_KWARGS[key] for key in kwargs})
+        elif skipped:
+            skipped(name, kwargs)
+
+
+def successful(status):
+    return 200 <= status < 300 or status == 304
+
+
+def percentile(values, p):
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "urls.py 의 각 URL 에 대해 응답 시간 백분위와 쿼리 수를 측정하고 "
+        "settings.BLOG_QUERY_BUDGETS 의 쿼리 예산을 넘거나 2xx, 304 가 아닌 응답이 있으면 실패합니다. "
+        "--sizes 를 지정하면 규모마다 seed_blog --flush 로 데이터를 다시 만듭니다(기존 데이터 삭제)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="*", choices=DATA_SIZES, default=[],
+                            help="측정할 데이터 규모 (생략하면 현재 데이터로 측정)")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warm", action="store_true", help="페이지 캐시를 비우지 않고 측정")
+        parser.add_argument("--htmx", action="store_true", help="HX-Request 헤더를 붙여 부분 템플릿 요청")
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        budgets = getattr(settings, "BLOG_QUERY_BUDGETS", {})
+        violations = []
+        for size in options["sizes"] or [None]:
+            if size:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"데이터 규모: {size}"))
+                call_command("seed_blog", flush=True, seed=options["seed"], stdout=self.stdout, **DATA_SIZES[size])
+            for name, path in url_targets(self.skipped):
+                result = self.measure(path, options)
+                budget = budgets.get(name)
+                line = (
+                    f"{name:24} {path:32} p50 {result['p50']:7.1f}ms  p95 {result['p95']:7.1f}ms  "
+                    f"p99 {result['p99']:7.1f}ms  queries {result['queries']:3}"
+                )
+                if not successful(result["status"]):
+                    # 오류 응답은 쿼리 수와 응답 시간이 실제보다 적게 측정되므로 실패로 처리
+                    violations.append(f"{size or 'current'} {name}: HTTP {result['status']}")
+                    self.stdout.write(self.style.ERROR(f"{line} (HTTP {result['status']})"))
+                elif budget is not None and result["queries"] > budget:
+                    violations.append(f"{size or 'current'} {name}: {result['queries']} > {budget}")
+                    self.stdout.write(self.style.ERROR(f"{line} (예산 {budget} 초과)"))
+                else:
+                    self.stdout.write(line)
+
+        if violations:
+            raise CommandError("쿼리 예산을 초과했거나 오류로 응답한 URL 이 있습니다:\n" + "\n".join(violations))
+
+    def skipped(self, name, kwargs):
+        self.stdout.write(self.style.WARNING(f"{name}: 인자 {sorted(kwargs)} 를 채울 수 없어 건너뜁니다."))
+
+    def measure(self, path, options):
+        headers = {"HX-Request": "true"} if options["htmx"] else {}
+        client = Client(SERVER_NAME=options["host"], raise_request_exception=False, headers=headers)
+        client.get(path)
+        timings, queries, status = [], 0, 200
+        for _ in range(options["iterations"]):
+            if not options["warm"]:
+                cache.clear()
+            contexts = [CaptureQueriesContext(connections[alias]) for alias in connections]
+            for context in contexts:
+                context.__enter__()
+            started = time.perf_counter()
+            try:
+                response = client.get(path)
+            finally:
+                elapsed = time.perf_counter() - started
+                for context in contexts:
+                    context.__exit__(None, None, None)
+            timings.append(elapsed * 1000)
+            queries = max(queries, sum(len(context) for context in contexts))
+            # 한 번이라도 실패한 응답이 있으면 그 상태 코드를 보고
+            if successful(status):
+                status = response.status_code
+        return {
+            "p50": statistics.median(timings),
+            "p95": percentile(timings, 95),
+            "p99": percentile(timings, 99),
+            "queries": queries,
+            "status": status,
+        }
@@ -0,0 +1,98 @@
+import re
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.archives import category_post_counts, month_post_counts
+
+from .benchmark_views import url_targets
+
+
+# URL 이름별로 추가로 확인할 쿼리 문자열 (두 번째 페이지, 검색어 길이별 경로 등)
+EXTRA_QUERY_STRINGS = {
+    "posts": ["page=2"],
+    "guestbooks": ["page=2"],
+    "portfolios": ["page=2"],
+    "search": ["q=내용", "q=내"],
+}
+
+# 행 수가 작아 전체 탐색이 문제되지 않는 테이블
+ALLOWED_SCAN_TABLES = {"django_content_type", "django_migrations"}
+
+# pk 하나나 한 페이지 분량의 키 목록으로 읽은 행(prefetch, 상세 집계 등)은 메모리 정렬을 허용
+KEY_LIST_RE = re.compile(r'"\w+"\."(?:id|\w+_id)" (?:IN \(|= \d)')
+
+
+def plan_problems(detail, sql):
+    if "USE TEMP B-TREE" in detail:
+        return not KEY_LIST_RE.search(sql)
+    if not detail.startswith("SCAN "):
+        return False
+    table = detail.split()[1]
+    return not ("INDEX" in detail or table.startswith("(") or table in ALLOWED_SCAN_TABLES
+                or detail.startswith("SCAN CONSTANT ROW"))
+
+
+class Command(BaseCommand):
+    help = (
+        "urls.py 의 각 URL 이 실행하는 SELECT 쿼리에 EXPLAIN QUERY PLAN 을 실행해 "
+        "인덱스 없는 전체 테이블 탐색이나 임시 B-tree 정렬이 있으면 실패합니다 (SQLite 전용)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument("--verbose-plans", action="store_true", help="문제가 없는 쿼리의 실행 계획도 출력")
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME=options["host"], raise_request_exception=False)
+        checked, failures = set(), []
+        for name, path in url_targets():
+            for query_string in [""] + EXTRA_QUERY_STRINGS.get(name, []):
+                url = f"{path}?{query_string}" if query_string else path
+                cache.clear()
+                # 캐시가 비었을 때만 실행되는 전체 집계(개수 재계산)는 검사 대상에서 제외
+                category_post_counts.get_all()
+                month_post_counts.get_all()
+                contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in connections}
+                for context in contexts.values():
+                    context.__enter__()
+                try:
+                    client.get(url)
+                finally:
+                    for context in contexts.values():
+                        context.__exit__(None, None, None)
+
+                for alias, context in contexts.items():
+                    for query in context.captured_queries:
+                        sql = query["sql"]
+                        if not sql.lstrip().upper().startswith("SELECT") or (alias, sql) in checked:
+                            continue
+                        checked.add((alias, sql))
+                        if failure := self.check_plan(alias, sql, url, options["verbose_plans"]):
+                            failures.append(failure)
+
+        self.stdout.write(f"{len(checked)}개 쿼리의 실행 계획을 확인했습니다.")
+        if failures:
+            raise CommandError(f"인덱스를 사용하지 않는 쿼리 {len(failures)}개:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("모든 쿼리가 인덱스를 사용합니다."))
+
+    def check_plan(self, alias, sql, url, verbose):
+        connection = connections[alias]
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN 은 SQLite 에서만 지원합니다.")
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = [row[3] for row in cursor.fetchall()]
+
+        problems = [detail for detail in plan if plan_problems(detail, sql)]
+        if problems or verbose:
+            style = self.style.ERROR if problems else self.style.SQL_KEYWORD
+            self.stdout.write(style(f"{url}\n  {sql}"))
+            for detail in plan:
+                self.stdout.write(f"    {'!' if detail in problems else ' '} {detail}")
+        if problems:
+            return f"{url}: {'; '.join(problems)}"
+        return None
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+
+from j3onghoon.urls import ASYNC_ROUTE_NAMES, build_urlpatterns
+
+
+def urlconf(name, async_routes):
+    # 설정의 BLOG_ASYNC_ROUTES 와 관계없이 한쪽은 동기 뷰, 다른 쪽은 비동기 뷰로 라우팅
+    module = ModuleType(name)
+    module.urlpatterns = build_urlpatterns(async_routes)
+    return module
+
+
+class HostAsyncClient(AsyncClient):
+    # AsyncClient 는 host 헤더를 항상 testserver 로 보내므로 지정한 호스트로 바꿈
+    def __init__(self, host, **kwargs):
+        super().__init__(**kwargs)
+        self.host = host.encode("ascii")
+
+    def _base_scope(self, **request):
+        scope = super()._base_scope(**request)
+        scope["headers"] = [(name, self.host if name == b"host" else value) for name, value in scope["headers"]]
+        return scope
+
+
+class Command(BaseCommand):
+    help = (
+        "같은 경로를 WSGI 핸들러(동기 뷰)와 ASGI 핸들러(비동기 뷰)로 반복 요청해 처리량(req/s)을 비교합니다. "
+        "200 이 아닌 응답이 있으면 실패합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="요청할 경로 (예: /posts/ /posts/1)")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--host", default="localhost", help="ALLOWED_HOSTS 에 포함된 호스트")
+        parser.add_argument("--htmx", action="store_true", help="HX-Request 헤더를 붙여 부분 템플릿 요청")
+
+    def handle(self, *args, **options):
+        headers = {"HX-Request": "true"} if options["htmx"] else {}
+        for path in options["paths"]:
+            with override_settings(ROOT_URLCONF=urlconf("compare_throughput_sync_urls", set())):
+                wsgi = self.run_wsgi(path, options, headers)
+            with override_settings(ROOT_URLCONF=urlconf("compare_throughput_async_urls", ASYNC_ROUTE_NAMES)):
+                asgi = asyncio.run(self.run_asgi(path, options, headers))
+            self.stdout.write(f"{path}: WSGI {wsgi:.1f} req/s, ASGI {asgi:.1f} req/s ({asgi / wsgi:.2f}x)")
+
+    def run_wsgi(self, path, options, headers):
+        def worker(count):
+            client = Client(SERVER_NAME=options["host"], headers=headers)
+            return Counter(client.get(path).status_code for _ in range(count))
+
+        counts = self.split(options["requests"], options["concurrency"])
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            statuses = sum(executor.map(worker, counts), Counter())
+        elapsed = time.perf_counter() - started
+        self.check_statuses("WSGI", path, statuses)
+        return options["requests"] / elapsed
+
+    async def run_asgi(self, path, options, headers):
+        async def worker(count):
+            client = HostAsyncClient(options["host"], headers=headers)
+            return Counter([(await client.get(path)).status_code for _ in range(count)])
+
+        counts = self.split(options["requests"], options["concurrency"])
+        started = time.perf_counter()
+        statuses = sum(await asyncio.gather(*(worker(count) for count in counts)), Counter())
+        elapsed = time.perf_counter() - started
+        self.check_statuses("ASGI", path, statuses)
+        return options["requests"] / elapsed
+
+    @staticmethod
+    def check_statuses(handler, path, statuses):
+        # 오류 응답은 정상 응답보다 훨씬 빨라 비교 결과를 왜곡하므로 실패로 처리
+        if failed := {status: count for status, count in statuses.items() if status != 200}:
+            summary = ", ".join(f"{status} x{count}" for status, count in sorted(failed.items()))
+            raise CommandError(f"{path}: {handler} 응답이 200 이 아닙니다 ({summary})")
+
+    @staticmethod
+    def split(total, parts):
+        return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
@@ -0,0 +1,162 @@
+import json
+import math
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog import views
+from blog.models import Category, Comment, Post
+
+
+MANIFEST_NAME = "manifest.json"
+LIST_VIEWS = {
+    Post.PostType.POST: ("posts", views.PostListView),
+    Post.PostType.GUESTBOOK: ("guestbooks", views.GuestBookListView),
+    Post.PostType.PORTFOLIO: ("portfolios", views.PortfolioListView),
+}
+
+
+def init_worker():
+    if not settings.configured or not django.apps.apps.ready:
+        django.setup()
+
+
+def page_path(url_name, page, partial):
+    # 웹 서버는 ?page=N 과 HX-Request 헤더를 보고 아래 경로의 파일을 응답하도록 설정
+    path = Path(reverse(url_name).strip("/"))
+    if partial:
+        path /= "partial"
+    if page > 1:
+        path = path / "page" / str(page)
+    return path / "index.html"
+
+
+def render_page(output, spec):
+    # 워커 프로세스에서 실행. 뷰를 직접 호출해 응답 본문을 파일로 저장
+    kind, key, page, partial = spec
+    headers = {"HTTP_HX_REQUEST": "true"} if partial else {}
+    try:
+        if kind == "list":
+            url_name, view_class = LIST_VIEWS[key]
+            # 커서 모드 목록도 ?page= 가 있으면 페이지 번호로 나뉘므로 첫 페이지에도 붙여 정적 경로와 링크를 맞춤
+            request = RequestFactory().get(reverse(url_name), {"page": page}, **headers)
+            response = view_class.as_view()(request)
+            path = page_path(url_name, page, partial)
+        else:
+            request = RequestFactory().get(reverse("post-detail", args=[key]))
+            response = views.PostDetailView.as_view(count_views=False)(request, pk=key)
+            path = Path(reverse("post-detail", args=[key]).strip("/")) / "index.html"
+        if hasattr(response, "render"):
+            response.render()
+        if response.status_code != 200:
+            return str(path), f"HTTP {response.status_code}"
+
+        target = Path(output) / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(response.content)
+        return str(path), None
+    except Exception as e:
+        return spec, str(e)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "목록(전체/HTMX 부분)과 상세 페이지를 정적 HTML 로 내보냅니다. "
+        "이전 내보내기 manifest 이후 변경된 게시물, 댓글, 카테고리에 해당하는 페이지만 다시 렌더링합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="출력 디렉터리")
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--full", action="store_true", help="manifest 를 무시하고 모든 페이지를 렌더링")
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        manifest_path = output / MANIFEST_NAME
+        manifest = {} if options["full"] or not manifest_path.exists() else json.loads(manifest_path.read_text())
+        since = parse_datetime(manifest["exported_at"]) if manifest.get("exported_at") else None
+        started = timezone.now()
+
+        detail_pks, list_types = self.changed_pages(since)
+        specs = [("detail", pk, 1, False) for pk in detail_pks]
+        pages = dict(manifest.get("pages", {}))
+        for post_type in list_types:
+            count = Post.objects.filter(type=post_type).count()
+            num_pages = max(1, math.ceil(count / views.PostBaseListView.paginate_by))
+            specs += [("list", post_type, page, partial) for page in range(1, num_pages + 1) for partial in (False, True)]
+            self.prune_list_pages(output, post_type, num_pages, pages.get(post_type, 0))
+            pages[post_type] = num_pages
+
+        removed = self.prune_detail_pages(output, since)
+
+        # 포크 전에 연결을 닫아 워커가 부모의 SQLite 연결을 공유하지 않도록 함
+        connections.close_all()
+        failed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=init_worker) as executor:
+            for path, error in executor.map(render_page, [str(output)] * len(specs), specs, chunksize=8):
+                if error:
+                    failed += 1
+                    self.stderr.write(f"렌더링 실패 ({path}): {error}")
+
+        output.mkdir(parents=True, exist_ok=True)
+        # 실패한 페이지가 있으면 기준 시각을 그대로 두어 다음 실행에서 같은 변경분을 다시 렌더링
+        exported_at = manifest.get("exported_at") if failed else started.isoformat()
+        manifest_path.write_text(json.dumps({"exported_at": exported_at, "pages": pages}))
+        if failed:
+            self.stderr.write(f"{failed}개 페이지 렌더링에 실패해 manifest 의 기준 시각을 갱신하지 않았습니다.")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(specs) - failed}개 페이지를 렌더링하고 {removed}개 게시물 페이지를 삭제했습니다. (실패 {failed}개)"
+        ))
+
+    def changed_pages(self, since):
+        posts = Post.objects.all()
+        if since is None:
+            return list(posts.values_list("pk", flat=True)), list(LIST_VIEWS)
+
+        # 소프트 삭제는 updated 를 갱신하지 않으므로 deleted 도 함께 확인
+        changed = Q(updated__gt=since) | Q(deleted__gt=since)
+        # 카테고리 이름이나 위치가 바뀌면 하위 카테고리 게시물의 카테고리 경로 표시도 바뀜
+        changed_categories = Q()
+        for category in Category.all_objects.filter(changed).only("path"):
+            changed_categories |= category.subtree_filter("category__")
+        changed_posts = Post.all_objects.filter(
+            changed
+            | Q(pk__in=Comment.all_objects.filter(changed).values("post"))
+            | changed_categories
+        )
+        detail_pks = list(changed_posts.filter(is_active=True).values_list("pk", flat=True))
+        list_types = list(changed_posts.values_list("type", flat=True).distinct().order_by())
+        return detail_pks, list_types
+
+    def prune_detail_pages(self, output, since):
+        deleted = Post.all_objects.inactive()
+        if since is not None:
+            deleted = deleted.filter(deleted__gt=since)
+
+        removed = 0
+        for pk in deleted.values_list("pk", flat=True).iterator():
+            path = output / reverse("post-detail", args=[pk]).strip("/")
+            if path.exists():
+                shutil.rmtree(path)
+                removed += 1
+        return removed
+
+    def prune_list_pages(self, output, post_type, num_pages, previous_pages):
+        url_name, _view = LIST_VIEWS[post_type]
+        for page in range(num_pages + 1, previous_pages + 1):
+            for partial in (False, True):
+                path = output / page_path(url_name, page, partial)
+                if path.exists():
+                    shutil.rmtree(path.parent)
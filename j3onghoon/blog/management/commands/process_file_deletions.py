@@ -0,0 +1,48 @@
+import time
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import FileDeletion
+
+
+class Command(BaseCommand):
+    help = "삭제 큐에 기록된 저장소 파일을 일괄 삭제합니다. 실패한 항목은 지수 백오프로 다시 시도합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument("--loop", action="store_true", help="큐를 계속 감시하며 처리")
+        parser.add_argument("--interval", type=float, default=5, help="--loop 사용 시 대기 시간(초)")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.process(options["batch_size"], options["max_attempts"])
+            if processed:
+                self.stdout.write(f"{processed}개 파일을 삭제했습니다.")
+            if not options["loop"]:
+                return
+            if processed < options["batch_size"]:
+                time.sleep(options["interval"])
+
+    def process(self, batch_size, max_attempts):
+        now = timezone.now()
+        batch = list(FileDeletion.objects.filter(next_attempt__lte=now, attempts__lt=max_attempts)[:batch_size])
+
+        done = []
+        for deletion in batch:
+            try:
+                default_storage.delete(deletion.name)
+            except Exception as e:
+                deletion.attempts += 1
+                deletion.last_error = str(e)
+                deletion.next_attempt = now + timedelta(seconds=2 ** deletion.attempts * 30)
+                deletion.save(update_fields=["attempts", "last_error", "next_attempt", "updated"])
+                self.stderr.write(f"파일 삭제 실패 ({deletion.name}): {e}")
+            else:
+                done.append(deletion.pk)
+
+        FileDeletion.objects.filter(pk__in=done).delete()
+        return len(done)
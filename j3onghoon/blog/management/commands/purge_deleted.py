@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from blog.models import Attachment, Category, Comment, Post
+
+
+class Command(BaseCommand):
+    help = "보존 기간이 지난 소프트 삭제(is_active=False) 행을 작은 트랜잭션 단위로 영구 삭제합니다."
+
+    models = (Comment, Post, Category, Attachment)
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="보존 기간(일)")
+        parser.add_argument("--chunk-size", type=int, default=200, help="한 트랜잭션에서 삭제할 행 수")
+        parser.add_argument("--pause", type=float, default=0.05,
+                            help="청크 사이 대기 시간(초). 다른 쓰기 작업이 잠금을 얻을 수 있도록 함")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        for model in self.models:
+            purged = 0
+            queryset = self.purgeable(model, cutoff)
+            while pks := list(queryset.values_list("pk", flat=True)[:options["chunk_size"]]):
+                with transaction.atomic():
+                    model.all_objects.filter(pk__in=pks).hard_delete()
+                purged += len(pks)
+                time.sleep(options["pause"])
+            self.stdout.write(f"{model._meta.verbose_name}: {purged}개 행을 삭제했습니다.")
+
+    def purgeable(self, model, cutoff):
+        queryset = model.all_objects.inactive().filter(deleted__lt=cutoff)
+        if model is Category:
+            # 하위 카테고리는 CASCADE 로 함께 지워지므로 활성이거나 보존 기간이 남은 하위 카테고리가 있으면 건너뜀
+            kept = Category.all_objects.filter(path__startswith=OuterRef("path")).exclude(pk=OuterRef("pk"))\
+                .exclude(is_active=False, deleted__lt=cutoff)
+            queryset = queryset.exclude(Exists(kept))
+        return queryset.order_by("pk")
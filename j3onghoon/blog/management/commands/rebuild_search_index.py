@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = "게시물과 댓글의 전문 검색 색인을 배치 단위로 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        indexed = search.rebuild(options["batch_size"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"{indexed}개 행을 색인했습니다."))
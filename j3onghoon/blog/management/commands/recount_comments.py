@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.cache import bump_generation
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = "게시물의 comments_count 를 활성 댓글 수로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="한 트랜잭션에서 처리할 게시물 pk 범위")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        bounds = Post.all_objects.aggregate(start=Min("pk"), end=Max("pk"))
+        if bounds["start"] is None:
+            return
+
+        counts = Comment.objects.filter(post=OuterRef("pk")).order_by()\
+            .values("post").annotate(count=Count("pk")).values("count")
+
+        updated, post_types = 0, set()
+        for start in range(bounds["start"], bounds["end"] + 1, batch_size):
+            with transaction.atomic():
+                # 값이 틀린 게시물만 갱신하고, 캐시된 페이지에 틀린 수가 남지 않도록 해당 유형을 무효화
+                stale = Post.all_objects.filter(pk__gte=start, pk__lt=start + batch_size)\
+                    .alias(actual=Coalesce(Subquery(counts), 0)).exclude(comments_count=F("actual"))
+                post_types.update(stale.values_list("type", flat=True).distinct().order_by())
+                updated += stale.update(comments_count=Coalesce(Subquery(counts), 0))
+
+        bump_generation(*post_types)
+        self.stdout.write(self.style.SUCCESS(f"{updated}개 게시물의 댓글 수를 바로잡았습니다."))
@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump_generation
+from blog.models import Post
+from blog.rendering import get_renderer_version, render_markdown
+
+
+def render_batch(rows):
+    return [(pk, render_markdown(content)) for pk, content in rows]
+
+
+class Command(BaseCommand):
+    help = "렌더러 버전이 다른 게시물의 Markdown 을 여러 프로세스에서 배치 단위로 다시 렌더링합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--workers", type=int, default=None, help="렌더링 프로세스 수 (기본값: CPU 수)")
+        parser.add_argument("--all", action="store_true", help="버전과 관계없이 모두 다시 렌더링")
+
+    def handle(self, *args, **options):
+        version = get_renderer_version()
+        posts = Post.all_objects.order_by("pk")
+        if not options["all"]:
+            posts = posts.exclude(render_version=version)
+
+        batch_size = options["batch_size"]
+        workers = options["workers"] or os.cpu_count()
+        rendered = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            last_pk = 0
+            while True:
+                # 한 번에 workers 개 배치를 읽어 병렬로 렌더링하고 결과를 bulk_update 로 저장
+                rows = list(posts.filter(pk__gt=last_pk).values_list("pk", "content")[:batch_size * workers])
+                if not rows:
+                    break
+                last_pk = rows[-1][0]
+                batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+                for results in executor.map(render_batch, batches):
+                    updates = [Post(pk=pk, render_version=version, **fields) for pk, fields in results]
+                    Post.all_objects.bulk_update(updates, Post.RENDERED_FIELDS)
+                    rendered += len(updates)
+                self.stdout.write(f"{rendered}개 게시물을 렌더링했습니다.")
+
+        if rendered:
+            # bulk_update 는 시그널을 보내지 않고 updated 도 바꾸지 않으므로 목록 페이지 캐시를 직접 무효화
+            bump_generation(*Post.PostType.values)
+
+        self.stdout.write(self.style.SUCCESS(f"렌더러 버전 {version}: {rendered}개 게시물을 다시 렌더링했습니다."))
@@ -0,0 +1,178 @@
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from blog.archives import category_post_counts, month_post_counts
+from blog.cache import bump_generation
+from blog.models import Attachment, Category, Comment, FileType, Post, User
+from blog.rendering import get_renderer_version, render_markdown
+
+
+SEED_EMAIL_DOMAIN = "seed.example"
+BASE_DATETIME = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# 파일 유형별로 확장자가 맞는 작은 더미 파일을 만듦 (이미지는 1x1 PNG)
+ATTACHMENT_SAMPLES = {
+    FileType.IMAGE: ("png", bytes.fromhex(
+        "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+        "1f15c4890000000d49444154789c63f8ffff3f0005fe02fea7d6a4a00000000049454e44ae426082"
+    )),
+    FileType.VIDEO: ("mp4", b"\x00\x00\x00\x18ftypmp42"),
+    FileType.DOCUMENT: ("pdf", b"%PDF-1.4\n%%EOF\n"),
+    FileType.AUDIO: ("mp3", b"ID3\x03\x00\x00\x00\x00\x00\x00"),
+    FileType.OTHER: ("bin", b"\x00\x01\x02\x03"),
+}
+
+CONTENT_TEMPLATES = [
+    "# 소개\n\n테스트용 게시물입니다. **굵게**, *기울임*, `코드`를 포함합니다.\n\n## 본문\n\n" + "내용 " * 200,
+    "## 목록\n\n- 첫째\n- 둘째\n- 셋째\n\n```python\nprint('hello')\n```\n\n" + "문단 " * 80,
+    "짧은 방명록 글입니다. [링크](https://example.com)",
+    "# 프로젝트\n\n| 항목 | 값 |\n| --- | --- |\n| 언어 | Python |\n\n### 설명\n\n" + "설명 " * 400,
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "성능 측정용 데이터를 같은 시드에서 항상 같은 결과가 나오도록 생성합니다. "
+        "--flush 를 지정하면 기존 게시물, 댓글, 카테고리, 첨부 파일과 시드 사용자를 먼저 삭제합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--category-depth", type=int, default=3)
+        parser.add_argument("--category-fanout", type=int, default=3)
+        parser.add_argument("--posts", type=int, default=100, help="게시물 유형별 게시물 수")
+        parser.add_argument("--comments", type=int, default=10, help="게시물별 최상위 댓글 수")
+        parser.add_argument("--reply-depth", type=int, default=3, help="답글 최대 깊이")
+        parser.add_argument("--reply-ratio", type=float, default=0.5, help="각 깊이에서 답글이 달릴 댓글 비율")
+        parser.add_argument("--attachments", type=int, default=2, help="파일 유형별 첨부 파일 수")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--flush", action="store_true")
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        if options["flush"]:
+            self.flush()
+
+        with transaction.atomic():
+            users = self.create_users(options["users"])
+            categories = self.create_categories(options["category_depth"], options["category_fanout"])
+            posts = self.create_posts(options["posts"], users, categories)
+            comments = self.create_comments(posts, users, options["comments"],
+                                            options["reply_depth"], options["reply_ratio"])
+        # 일괄 생성은 시그널을 보내지 않으므로 파생 데이터를 한 번에 다시 계산
+        call_command("recount_comments", stdout=self.stdout)
+        call_command("rebuild_search_index", stdout=self.stdout)
+
+        # 변환본 생성은 벤치마크 대상이 아니므로 첨부 파일 저장 시에는 생략
+        with override_settings(BLOG_EAGER_RENDITIONS=False):
+            attachments = self.create_attachments(users + categories, options["attachments"])
+
+        bump_generation(*Post.PostType.values)
+        category_post_counts.invalidate()
+        month_post_counts.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f"사용자 {len(users)}, 카테고리 {len(categories)}, 게시물 {len(posts)}, "
+            f"댓글 {comments}, 첨부 파일 {attachments}개를 생성했습니다."
+        ))
+
+    def flush(self):
+        with transaction.atomic():
+            Attachment.all_objects.hard_delete()
+            Comment.all_objects.hard_delete()
+            Post.all_objects.hard_delete()
+            Category.all_objects.hard_delete()
+            User.all_objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").hard_delete()
+
+    def timestamp(self):
+        return BASE_DATETIME + timedelta(seconds=self.random.randrange(365 * 24 * 60 * 60))
+
+    def create_users(self, count):
+        password = make_password("password")
+        users = [
+            User(
+                username=f"seed{i}",
+                email=f"seed{i}@{SEED_EMAIL_DOMAIN}",
+                password=password,
+                first_name=f"사용자{i}",
+                created=self.timestamp(),
+            )
+            for i in range(count)
+        ]
+        return User.objects.bulk_create(users, batch_size=self.batch_size)
+
+    def create_categories(self, depth, fanout):
+        # 경로 계산은 save() 에서 하므로 하나씩 저장 (fanout ** depth 개 수준)
+        categories = []
+        level = [None]
+        for d in range(depth):
+            next_level = []
+            for parent in level:
+                for i in range(fanout):
+                    prefix = f"{parent.slug}-" if parent else "seed-"
+                    category = Category.objects.create(
+                        name=f"카테고리 {d}-{len(next_level)}", slug=f"{prefix}{i}", parent=parent,
+                    )
+                    next_level.append(category)
+            categories.extend(next_level)
+            level = next_level
+        return categories
+
+    def create_posts(self, count, users, categories):
+        version = get_renderer_version()
+        rendered = [render_markdown(content) for content in CONTENT_TEMPLATES]
+        posts = []
+        for post_type in Post.PostType.values:
+            for i in range(count):
+                template = self.random.randrange(len(CONTENT_TEMPLATES))
+                posts.append(Post(
+                    title=f"{post_type} {i}",
+                    content=CONTENT_TEMPLATES[template],
+                    author=self.random.choice(users) if users else None,
+                    category=self.random.choice(categories) if categories else None,
+                    type=post_type,
+                    views=self.random.randrange(1000),
+                    created=self.timestamp(),
+                    render_version=version,
+                    **rendered[template],
+                ))
+        return Post.objects.bulk_create(posts, batch_size=self.batch_size)
+
+    def create_comments(self, posts, users, count, reply_depth, reply_ratio):
+        # 깊이별로 일괄 생성해 이전 깊이의 pk 를 상위 댓글로 사용
+        level = [
+            Comment(post=post, author=self.random.choice(users) if users else None,
+                    content=f"댓글 {i}", created=self.timestamp())
+            for post in posts for i in range(count)
+        ]
+        total = 0
+        for _ in range(reply_depth + 1):
+            if not level:
+                break
+            level = Comment.objects.bulk_create(level, batch_size=self.batch_size)
+            total += len(level)
+            level = [
+                Comment(post_id=parent.post_id, parent=parent, author=self.random.choice(users) if users else None,
+                        content=f"{parent.content}에 대한 답글", created=parent.created + timedelta(minutes=1))
+                for parent in level if self.random.random() < reply_ratio
+            ]
+        return total
+
+    def create_attachments(self, owners, count):
+        created = 0
+        for owner in owners:
+            for file_type, (extension, content) in ATTACHMENT_SAMPLES.items():
+                for i in range(count):
+                    name = f"{owner._meta.model_name}-{owner.pk}-{file_type}-{i}.{extension}"
+                    owner.add_attachment(ContentFile(content, name=name), order=i)
+                    created += 1
+        return created
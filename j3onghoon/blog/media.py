@@ -0,0 +1,138 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+from django.views import View
+
+from .models import Attachment, Rendition
+
+
+MEDIA_CHUNK_SIZE = 64 * 1024
+# 내용이 바뀌면 URL 의 v 값도 바뀌므로 v 가 현재 digest 와 같으면 오래 캐시해도 안전함
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    # 단일 구간만 지원. 형식이 다르거나 여러 구간이면 None (전체 응답), 만족할 수 없으면 False (416)
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if not match or match.groups() == ("", ""):
+        return None
+    # 빈 파일에는 만족할 수 있는 구간이 없음
+    if not size:
+        return False
+    start, end = match.groups()
+    if not start:
+        length = int(end)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    # If-Range 는 강한 비교만 허용 (약한 ETag 이면 전체 응답)
+    value = request.headers.get("If-Range")
+    if value is None:
+        return True
+    if value.startswith('"'):
+        return etag is not None and value == etag
+    date = parse_http_date_safe(value)
+    return date is not None and date == int(last_modified)
+
+
+def read_range(file, start, end, chunk_size=MEDIA_CHUNK_SIZE):
+    with file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class AttachmentFileView(View):
+    # rendition 이 있으면 원본 대신 해당 규격의 변환본을 전송
+    def get(self, request, pk, rendition=None):
+        attachment = get_object_or_404(Attachment.objects.select_related("blob"), pk=pk)
+        served, filename = attachment, attachment.name
+        if rendition is not None:
+            served = get_object_or_404(Rendition, attachment=attachment, name=rendition)
+            served.attachment = attachment
+            filename = served.file.name.split("/")[-1]
+        if not served.file:
+            raise Http404
+
+        # 변환본은 원본 digest 와 변환본 id 로 식별
+        digest = attachment.blob and (served.version if rendition is not None else attachment.blob.digest)
+        etag = quote_etag(digest) if digest else None
+        last_modified = int(served.updated.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.file_response(request, served, filename, etag, last_modified)
+
+        if etag:
+            response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Accept-Ranges"] = "bytes"
+        version = request.GET.get("v")
+        # 416 은 요청한 구간에 대한 응답이라 오래 캐시하지 않음
+        immutable = attachment.blob and version and version == served.version and response.status_code != 416
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        return response
+
+    def file_response(self, request, served, filename, etag, last_modified):
+        content_type = served.mime_type or "application/octet-stream"
+        sendfile = getattr(settings, "BLOG_ATTACHMENT_SENDFILE", None)
+        if sendfile:
+            # 파일 전송과 Range 처리는 웹 서버에 맡기고 헤더만 응답
+            response = HttpResponse(content_type=content_type)
+            response[self.sendfile_header(sendfile)] = self.sendfile_target(sendfile, served)
+            return response
+
+        size = served.size or served.file.size
+        byte_range = None
+        if (header := request.headers.get("Range")) and if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(header, size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416, content_type=content_type)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        file = served.file.open("rb")
+        if byte_range is None:
+            return FileResponse(file, content_type=content_type, filename=filename)
+
+        start, end = byte_range
+        response = StreamingHttpResponse(read_range(file, start, end), status=206, content_type=content_type)
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
+
+    @staticmethod
+    def sendfile_header(sendfile):
+        if sendfile == "x-sendfile":
+            return "X-Sendfile"
+        if sendfile == "x-accel-redirect":
+            return "X-Accel-Redirect"
+        raise ImproperlyConfigured(f"지원하지 않는 BLOG_ATTACHMENT_SENDFILE 값입니다: {sendfile}")
+
+    @staticmethod
+    def sendfile_target(sendfile, served):
+        if sendfile == "x-accel-redirect":
+            # nginx 의 internal location 아래 저장소 키 경로
+            return f"{getattr(settings, 'BLOG_ATTACHMENT_ACCEL_PREFIX', '/protected/')}{served.file.name}"
+        return served.file.path
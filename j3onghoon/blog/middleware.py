@@ -0,0 +1,222 @@
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+
+
+logger = logging.getLogger("blog.performance")
+
+# 현재 요청의 측정 기록. 샘플링되지 않은 요청에서는 None
+current_recorder = ContextVar("blog_query_recorder", default=None)
+
+SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+SQL_IN_LIST_RE = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+SOURCE_ROOT = str(Path(settings.BASE_DIR).resolve())
+MIDDLEWARE_FILE = __file__
+
+
+def fingerprint(sql):
+    # 리터럴과 IN (...) 목록 길이를 지워 같은 모양의 쿼리를 하나로 묶음
+    return SQL_IN_LIST_RE.sub("(...)", SQL_LITERAL_RE.sub("?", sql))
+
+
+def find_callsite():
+    # 쿼리를 실행한 가장 안쪽의 템플릿 노드 또는 프로젝트 코드 위치
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "render_annotated" and (token := getattr(frame.f_locals.get("self"), "token", None)):
+            origin = getattr(frame.f_locals["self"], "origin", None)
+            return f"{getattr(origin, 'template_name', None) or origin}:{token.lineno}"
+        filename = code.co_filename
+        if filename.startswith(SOURCE_ROOT) and filename != MIDDLEWARE_FILE and "site-packages" not in filename:
+            return f"{Path(filename).relative_to(SOURCE_ROOT)}:{frame.f_lineno} in {code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class RequestRecorder:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.fingerprints = Counter()
+        self.callsites = {}
+
+    def record(self, sql, duration):
+        self.db_time += duration
+        self.queries += 1
+        key = fingerprint(sql)
+        self.fingerprints[key] += 1
+        # 스택 탐색은 비용이 커서 같은 쿼리가 처음 반복될 때만 위치를 기록
+        if self.fingerprints[key] == 2:
+            self.callsites[key] = find_callsite()
+
+    def duplicates(self, threshold):
+        return [
+            {"sql": sql, "count": count, "callsite": self.callsites.get(sql)}
+            for sql, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.record(sql, time.perf_counter() - started)
+
+
+def install_wrapper(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_wrapper_on_connect(sender, connection, **kwargs):
+    # 비동기 ORM 은 별도 스레드의 연결을 사용하므로 연결이 만들어질 때마다 래퍼를 설치하고
+    # 요청 기록은 스레드로 전달되는 ContextVar 로 찾음
+    install_wrapper(connection)
+
+
+connection_created.connect(install_wrapper_on_connect, dispatch_uid="blog_query_instrumentation")
+
+
+def instrumented_render(render):
+    # 중첩된 include 까지 이중으로 세지 않도록 가장 바깥 템플릿의 렌더링 시간만 더함
+    def _render(self, context):
+        recorder = current_recorder.get()
+        if recorder is None:
+            return render(self, context)
+        recorder.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            recorder.template_depth -= 1
+            if not recorder.template_depth:
+                recorder.template_time += time.perf_counter() - started
+
+    return _render
+
+
+template_hook_lock = threading.Lock()
+template_hook_users = 0
+original_template_render = None
+
+
+@contextmanager
+def template_render_hook():
+    # 샘플링된 요청이 진행 중일 때만 Template._render 를 감쌈. 여러 스레드와 비동기 요청이 겹칠 수 있어
+    # 참조 수로 관리하고, 그동안 샘플링되지 않은 요청은 ContextVar 확인만 거쳐 원래 렌더링으로 넘어감
+    global template_hook_users, original_template_render
+    with template_hook_lock:
+        if not template_hook_users:
+            original_template_render = Template._render
+            Template._render = instrumented_render(original_template_render)
+        template_hook_users += 1
+    try:
+        yield
+    finally:
+        with template_hook_lock:
+            template_hook_users -= 1
+            if not template_hook_users:
+                Template._render = original_template_render
+
+
+class QueryInstrumentationMiddleware:
+    # 샘플링된 요청의 쿼리 수, DB 시간, 템플릿 렌더링 시간을 Server-Timing 헤더로 내보내고
+    # 느린 요청과 반복 쿼리(N+1)를 구조화된 로그로 남김
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "BLOG_QUERY_SAMPLE_RATE", 1.0)
+        self.slow_request_ms = getattr(settings, "BLOG_SLOW_REQUEST_MS", 500)
+        self.duplicate_threshold = getattr(settings, "BLOG_DUPLICATE_QUERY_THRESHOLD", 3)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        recorder, token = self.start()
+        started = time.perf_counter()
+        try:
+            with template_render_hook():
+                response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.finish(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        recorder, token = self.start()
+        started = time.perf_counter()
+        try:
+            with template_render_hook():
+                response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.finish(request, response, recorder, time.perf_counter() - started)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def start(self):
+        # 미들웨어가 로드되기 전에 이미 연결된 현재 스레드의 연결에도 래퍼 설치
+        for alias in connections:
+            install_wrapper(connections[alias])
+        recorder = RequestRecorder()
+        return recorder, current_recorder.set(recorder)
+
+    def finish(self, request, response, recorder, elapsed):
+        total_ms = elapsed * 1000
+        db_ms = recorder.db_time * 1000
+        template_ms = recorder.template_time * 1000
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={db_ms:.1f};desc="{recorder.queries} queries"',
+            f"tpl;dur={template_ms:.1f}",
+            f"total;dur={total_ms:.1f}",
+        ])
+
+        duplicates = recorder.duplicates(self.duplicate_threshold)
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 1),
+            "db_ms": round(db_ms, 1),
+            "template_ms": round(template_ms, 1),
+            "queries": recorder.queries,
+            "duplicate_queries": duplicates,
+        }
+        if duplicates:
+            logger.warning("반복 쿼리 감지 %s %s: %s", request.method, request.path,
+                           ", ".join(f"{d['count']}회 {d['callsite']}" for d in duplicates), extra=fields)
+        if total_ms >= self.slow_request_ms:
+            logger.warning("느린 요청 %s %s: %.1fms (쿼리 %d개)", request.method, request.path,
+                           total_ms, recorder.queries, extra=fields)
+        return response
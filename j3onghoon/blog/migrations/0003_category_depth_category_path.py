@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:26
+
+from django.db import migrations, models
+
+
+def fill_category_paths(apps, schema_editor):
+    Category = apps.get_model("blog", "Category")
+    paths = {}
+    pending = list(Category.objects.values_list("pk", "parent_id"))
+    while pending:
+        remaining = []
+        for pk, parent_id in pending:
+            if parent_id is None:
+                paths[pk] = (f"{pk}/", 0)
+            elif parent_id in paths:
+                parent_path, parent_depth = paths[parent_id]
+                paths[pk] = (f"{parent_path}{pk}/", parent_depth + 1)
+            else:
+                remaining.append((pk, parent_id))
+        if len(remaining) == len(pending):
+            break
+        pending = remaining
+
+    Category.objects.bulk_update(
+        [Category(pk=pk, path=path, depth=depth) for pk, (path, depth) in paths.items()],
+        ["path", "depth"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='깊이'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, verbose_name='경로'),
+        ),
+        migrations.RunPython(fill_category_paths, migrations.RunPython.noop),
+    ]
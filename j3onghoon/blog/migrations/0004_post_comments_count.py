@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:27
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    counts = Comment.objects.filter(post=models.OuterRef("pk"), is_active=True).order_by()\
+        .values("post").annotate(count=models.Count("pk")).values("count")
+    Post.objects.update(comments_count=Coalesce(models.Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_category_depth_category_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수'),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_comments_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='생성 일시')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='수정 일시')),
+                ('digest', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('file', models.FileField(max_length=255, upload_to='', verbose_name='파일')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='파일 크기(바이트)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='참조 수')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attachments', to='blog.blob', verbose_name='저장 파일'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blob_attachment_blob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Rendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='생성 일시')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='수정 일시')),
+                ('name', models.CharField(max_length=50, verbose_name='규격')),
+                ('file', models.FileField(max_length=255, upload_to='', verbose_name='파일')),
+                ('mime_type', models.CharField(blank=True, max_length=100, verbose_name='MIME 유형')),
+                ('width', models.PositiveIntegerField(default=0, verbose_name='너비')),
+                ('height', models.PositiveIntegerField(default=0, verbose_name='높이')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='파일 크기(바이트)')),
+                ('attachment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='blog.attachment', verbose_name='원본 첨부 파일')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('attachment', 'name'), name='unique_rendition_per_attachment')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_rendition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='생성 일시')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='수정 일시')),
+                ('name', models.CharField(max_length=255, verbose_name='저장소 키')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now, verbose_name='다음 시도 일시')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+            ],
+            options={
+                'ordering': ['next_attempt'],
+                'indexes': [models.Index(fields=['next_attempt'], name='blog_filede_next_at_c9035a_idx')],
+            },
+        ),
+    ]
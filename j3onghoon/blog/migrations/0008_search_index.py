@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_search_index USING fts5("
+        "title, content, kind UNINDEXED, object_id UNINDEXED, post_id UNINDEXED, post_type UNINDEXED, "
+        "tokenize = 'trigram')"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS blog_search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_filedeletion'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='렌더링된 본문'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='요약'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='읽는 시간(분)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='render_version',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='렌더러 버전'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='toc',
+            field=models.TextField(blank=True, editable=False, verbose_name='목차'),
+        ),
+    ]
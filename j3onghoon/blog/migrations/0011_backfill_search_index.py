@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def backfill_search_index(apps, schema_editor):
+    # 0008 이전에 작성된 게시물과 댓글도 검색되도록 색인을 채움
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DELETE FROM blog_search_index")
+    schema_editor.execute(
+        "INSERT INTO blog_search_index (title, content, kind, object_id, post_id, post_type) "
+        "SELECT title, content, 'post', id, id, type FROM blog_post WHERE is_active"
+    )
+    schema_editor.execute(
+        "INSERT INTO blog_search_index (title, content, kind, object_id, post_id, post_type) "
+        "SELECT '', c.content, 'comment', c.id, c.post_id, p.type "
+        "FROM blog_comment c JOIN blog_post p ON p.id = c.post_id WHERE c.is_active"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_active_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
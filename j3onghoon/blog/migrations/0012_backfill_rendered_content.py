@@ -0,0 +1,30 @@
+from django.db import migrations
+
+from blog.rendering import get_renderer_version, render_markdown
+
+
+BATCH_SIZE = 200
+RENDERED_FIELDS = ["content_html", "toc", "excerpt", "reading_time", "render_version"]
+
+
+def backfill_rendered_content(apps, schema_editor):
+    # 0009 이전에 작성된 게시물은 렌더링 결과가 비어 있어 본문이 보이지 않으므로 채움
+    Post = apps.get_model("blog", "Post")
+    version = get_renderer_version()
+    posts = Post.objects.using(schema_editor.connection.alias).filter(render_version="").order_by("pk")
+    last_pk = 0
+    while rows := list(posts.filter(pk__gt=last_pk).values_list("pk", "content")[:BATCH_SIZE]):
+        updates = [Post(pk=pk, render_version=version, **render_markdown(content)) for pk, content in rows]
+        Post.objects.using(schema_editor.connection.alias).bulk_update(updates, RENDERED_FIELDS)
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_backfill_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rendered_content, migrations.RunPython.noop),
+    ]
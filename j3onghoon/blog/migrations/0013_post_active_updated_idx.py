@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_backfill_rendered_content'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['type', 'updated'], name='post_active_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+from blog.rendering import get_renderer_version, render_markdown
+
+
+BATCH_SIZE = 200
+RENDERED_FIELDS = ["content_html", "toc", "excerpt", "reading_time", "render_version"]
+
+
+def rerender_content(apps, schema_editor):
+    # 이전 렌더러는 attr_list 속성과 문자 참조로 감춘 javascript: 링크를 그대로 출력했으므로 저장된 HTML 을 다시 렌더링
+    Post = apps.get_model("blog", "Post")
+    version = get_renderer_version()
+    posts = Post.objects.using(schema_editor.connection.alias).exclude(render_version=version).order_by("pk")
+    last_pk = 0
+    while rows := list(posts.filter(pk__gt=last_pk).values_list("pk", "content")[:BATCH_SIZE]):
+        updates = [Post(pk=pk, render_version=version, **render_markdown(content)) for pk, content in rows]
+        Post.objects.using(schema_editor.connection.alias).bulk_update(updates, RENDERED_FIELDS)
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_active_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(rerender_content, migrations.RunPython.noop),
+    ]
@@ -1,16 +1,21 @@
 import mimetypes
-import logging
+from collections import defaultdict
 
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
 from django.contrib.auth.models import BaseUserManager, AbstractUser
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.core.exceptions import ValidationError
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.utils import timezone
 
-from .utils import set_image
+from .signals import restored, soft_deleted
+from .utils import hash_file, set_image
 
 
 BYTE_SCALE = 1024
@@ -50,6 +55,11 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+def restore_timestamp_fields(model):
+    # 복원은 deleted 를 비우므로 updated 로 변경을 감지하는 곳(정적 내보내기 등)이 알 수 있도록 함께 갱신
+    return ["updated"] if any(field.name == "updated" for field in model._meta.concrete_fields) else []
+
+
 class SoftDeleteQuerySet(models.QuerySet):
     def active(self):
         return self.filter(is_active=True)
@@ -58,13 +68,25 @@ class SoftDeleteQuerySet(models.QuerySet):
         return self.filter(is_active=False)
 
     def delete(self):
-        return self.update(is_active=False, deleted=timezone.now)
+        return self._update_with_signal(soft_deleted, is_active=False, deleted=timezone.now())
 
     def hard_delete(self):
         return super().delete()
 
     def restore(self):
-        return self.update(is_active=True, deleted=None)
+        now = timezone.now()
+        return self._update_with_signal(restored, is_active=True, deleted=None,
+                                        **{field: now for field in restore_timestamp_fields(self.model)})
+
+    def _update_with_signal(self, signal, **kwargs):
+        if not signal.has_listeners(self.model):
+            return self.update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            pks = list(self.filter(is_active=not kwargs["is_active"]).values_list("pk", flat=True))
+            count = self.update(**kwargs)
+        signal.send(sender=self.model, pks=pks)
+        return count
 
 
 class ActiveManager(models.Manager):
@@ -106,14 +128,20 @@ class SoftDeleteModel(models.Model):
         abstract = True
 
     def delete(self, using=None, keep_parents=False):
+        was_active = self.is_active
         self.is_active = False
         self.deleted = timezone.now()
         self.save(using=using, update_fields=['is_active', 'deleted'])
+        if was_active:
+            soft_deleted.send(sender=self.__class__, pks=[self.pk])
 
     def restore(self):
+        was_active = self.is_active
         self.is_active = True
         self.deleted = None
-        self.save(update_fields=["is_active", "deleted"])
+        self.save(update_fields=["is_active", "deleted", *restore_timestamp_fields(self.__class__)])
+        if not was_active:
+            restored.send(sender=self.__class__, pks=[self.pk])
 
     def hard_delete(self, using=None, keep_parents=False):
         return super().delete(using=using, keep_parents=keep_parents)
@@ -124,6 +152,76 @@ class BaseModel(TimeStampedModel, SoftDeleteModel):
         abstract = True
 
 
+class BlobManager(models.Manager):
+    def store(self, file):
+        # 파일을 청크 단위로 읽어 SHA-256 을 계산하고, 같은 내용의 blob 이 있으면 참조 수만 늘림
+        digest, size = hash_file(file)
+        with transaction.atomic():
+            updated = self.filter(digest=digest).update(ref_count=F("ref_count") + 1)
+            if updated:
+                return self.get(digest=digest)
+
+            blob = self.model(digest=digest, size=size, ref_count=1)
+            blob.file.save(blob.storage_name(file.name), file, save=False)
+            try:
+                with transaction.atomic():
+                    blob.save()
+            except IntegrityError:
+                # 동시에 같은 내용이 업로드된 경우 먼저 저장된 blob 을 참조
+                blob.file.storage.delete(blob.file.name)
+                self.filter(digest=digest).update(ref_count=F("ref_count") + 1)
+                return self.get(digest=digest)
+            return blob
+
+
+class Blob(TimeStampedModel):
+    digest = models.CharField(_("SHA-256"), max_length=64, unique=True)
+    file = models.FileField(_("파일"), max_length=255)
+    size = models.PositiveBigIntegerField(_("파일 크기(바이트)"), default=0)
+    ref_count = models.PositiveIntegerField(_("참조 수"), default=0)
+
+    objects = BlobManager()
+
+    def __str__(self):
+        return self.digest
+
+    def storage_name(self, original_name):
+        extension = original_name.rsplit(".", 1)[-1].lower() if "." in original_name else ""
+        name = f"blobs/{self.digest[:2]}/{self.digest[2:4]}/{self.digest}"
+        return f"{name}.{extension}" if extension else name
+
+    def release(self):
+        # 마지막 참조가 사라진 경우에만 blob 행을 지우고 저장소 파일 삭제를 예약
+        with transaction.atomic():
+            Blob.objects.filter(pk=self.pk).update(ref_count=F("ref_count") - 1)
+            deleted, _rows = Blob.objects.filter(pk=self.pk, ref_count=0).delete()
+            if deleted:
+                FileDeletion.enqueue(self.file)
+        return bool(deleted)
+
+
+class FileDeletion(TimeStampedModel):
+    # 행 삭제와 같은 트랜잭션에서 기록되고, process_file_deletions 가 저장소에서 실제로 삭제
+    name = models.CharField(_("저장소 키"), max_length=255)
+    attempts = models.PositiveSmallIntegerField(_("시도 횟수"), default=0)
+    next_attempt = models.DateTimeField(_("다음 시도 일시"), default=timezone.now)
+    last_error = models.TextField(_("마지막 오류"), blank=True)
+
+    class Meta:
+        ordering = ["next_attempt"]
+        indexes = [
+            models.Index(fields=["next_attempt"]),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def enqueue(cls, file):
+        if file:
+            return cls.objects.create(name=file.name)
+
+
 class Attachment(BaseModel):
     file = models.FileField(_("파일"), max_length=255)
     name = models.CharField(_("파일명"), max_length=255, blank=True)
@@ -132,6 +230,8 @@ class Attachment(BaseModel):
     size = models.PositiveIntegerField(_("파일 크기(바이트)"), default=0)
     description = models.TextField(_("설명"), blank=True)
     order = models.PositiveIntegerField(_("정렬 순서"), default=0)
+    blob = models.ForeignKey("Blob", null=True, blank=True, editable=False,
+                             on_delete=models.PROTECT, related_name="attachments", verbose_name=_("저장 파일"))
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, verbose_name=_("콘텐츠 타입"))
     object_id = models.PositiveIntegerField(_("객체 ID"))
@@ -170,6 +270,25 @@ class Attachment(BaseModel):
                 return f"{size:.2f} {unit}" if unit != BYTE else f"{size} {unit}"
             size /= BYTE_SCALE
 
+    @property
+    def version(self):
+        return self.blob.digest[:12] if self.blob else ""
+
+    def get_absolute_url(self):
+        # 내용이 같으면 URL 도 같아 브라우저와 프록시가 오래 캐시할 수 있음
+        url = reverse("attachment-file", args=[self.pk])
+        return f"{url}?v={self.version}" if self.version else url
+
+    def rendition_url(self, name):
+        # 변환본이 아직 없으면 생성을 예약하고 원본 URL 을 반환
+        from .renditions import get_rendition
+        rendition = get_rendition(self, name)
+        return rendition.get_absolute_url() if rendition else self.get_absolute_url()
+
+    @property
+    def thumbnail_url(self):
+        return self.rendition_url("thumbnail")
+
     def save(self, *args, **kwargs):
         if not self.file:
             return super().save(*args, **kwargs)
@@ -177,29 +296,73 @@ class Attachment(BaseModel):
         if not self.name:
             self.name = self.file.name.split("/")[-1]
 
-        if (file_size := getattr(self.file, "size", 0)) > 0:
-            self.size = file_size
-
         if not self.file_type:
             self.file_type = EXTENSION_TO_FILE_TYPE.get(self.extension, FileType.OTHER)
 
         if not self.mime_type:
-            self.mime_type = mimetypes.guess_type(self.file.name)[0]
+            self.mime_type = mimetypes.guess_type(self.file.name)[0] or ""
 
-        super().save(*args, **kwargs)
+        if self.file._committed:
+            if not self.blob_id and (file_size := getattr(self.file, "size", 0)) > 0:
+                self.size = file_size
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            # 기존 첨부 파일의 파일을 바꾸는 경우 이전 blob 참조를 해제 (같은 내용이면 증가분과 상쇄됨)
+            previous = None
+            if self.pk:
+                previous = Attachment.all_objects.filter(pk=self.pk).values("file", "blob").first()
+
+            # 새로 업로드된 파일은 내용 해시 기준으로 저장하고 같은 내용이면 기존 blob 을 재사용
+            self.blob = Blob.objects.store(self.file)
+            self.file.name = self.blob.file.name
+            self.file._committed = True
+            self.size = self.blob.size
+            super().save(*args, **kwargs)
+
+            if previous:
+                self.release_previous_file(previous)
+
+    def release_previous_file(self, previous):
+        from .renditions import invalidate_renditions
+        if previous["blob"]:
+            Blob.objects.get(pk=previous["blob"]).release()
+        elif previous["file"]:
+            FileDeletion.objects.create(name=previous["file"])
+        invalidate_renditions([self.pk])
 
     def hard_delete(self, using=None, keep_parents=False):
-        storage = self.file.storage
-        if storage and self.file:
-            try:
-                storage.delete(self.file.name)
-            except Exception as e:
-                file_path = self.file.name if self.file else "알 수 없음"
-                error_msg = f"파일 삭제 실패 (ID: {self.pk}, 파일: {file_path}: {str(e)}"
-                logging.error(error_msg)
-                raise Exception(f"첨부 파일 삭제 실패: {str(e)}")
+        # 저장소 파일은 post_delete 에서 삭제 큐에 기록되므로 QuerySet 일괄 삭제에도 동일하게 적용됨
+        with transaction.atomic(using=using):
+            return super().hard_delete(using=using, keep_parents=keep_parents)
+
+
+class Rendition(TimeStampedModel):
+    attachment = models.ForeignKey("Attachment", on_delete=models.CASCADE,
+                                   related_name="renditions", verbose_name=_("원본 첨부 파일"))
+    name = models.CharField(_("규격"), max_length=50)
+    file = models.FileField(_("파일"), max_length=255)
+    mime_type = models.CharField(_("MIME 유형"), max_length=100, blank=True)
+    width = models.PositiveIntegerField(_("너비"), default=0)
+    height = models.PositiveIntegerField(_("높이"), default=0)
+    size = models.PositiveIntegerField(_("파일 크기(바이트)"), default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["attachment", "name"], name="unique_rendition_per_attachment"),
+        ]
+
+    def __str__(self):
+        return f"{self.attachment} ({self.name})"
+
+    @property
+    def version(self):
+        # 원본이 바뀌거나 변환본을 다시 만들면 달라짐
+        return f"{self.attachment.version}-{self.pk}"
 
-        return super().hard_delete(using=using, keep_parents=keep_parents)
+    def get_absolute_url(self):
+        url = reverse("attachment-rendition", args=[self.attachment_id, self.name])
+        return f"{url}?v={self.version}"
 
 
 class AttachmentMixin(models.Model):
@@ -209,6 +372,7 @@ class AttachmentMixin(models.Model):
         abstract = True
 
     def add_attachment(self, file, **kwargs):
+        self.clear_attachments_cache()
         return Attachment.objects.create(
             file=file,
             content_type=ContentType.objects.get_for_model(self),
@@ -216,12 +380,82 @@ class AttachmentMixin(models.Model):
             **kwargs,
         )
 
-    def get_attachments_by_type(self, file_type=None):
-        attachments = self.attachments.all()
+    @classmethod
+    def prefetch_attachments(cls, instances, renditions=False):
+        # 콘텐츠 타입별로 한 번의 쿼리((content_type, object_id) 인덱스 사용)로 첨부 파일을 읽어
+        # 인스턴스마다 file_type 별로 묶어 둠. 여러 모델의 인스턴스나 pk 가 같은 인스턴스가 섞여 있어도 됨
+        # renditions 이면 이미지 변환본도 한 번의 쿼리로 함께 읽음
+        instances = [instance for instance in instances if instance is not None and instance.pk]
+        for owners, attachments in cls._attachment_querysets(instances, renditions):
+            for attachment in attachments:
+                cls._add_prefetched_attachment(owners, attachment)
+        return instances
+
+    @classmethod
+    async def aprefetch_attachments(cls, instances, renditions=False):
+        instances = [instance for instance in instances if instance is not None and instance.pk]
+        # ContentType 캐시가 비어 있으면 동기 쿼리가 필요함
+        for owners, attachments in await sync_to_async(cls._attachment_querysets)(instances, renditions):
+            async for attachment in attachments:
+                cls._add_prefetched_attachment(owners, attachment)
+        return instances
+
+    @staticmethod
+    def _attachment_querysets(instances, renditions=False):
+        by_model = defaultdict(lambda: defaultdict(list))
+        for instance in instances:
+            by_model[instance._meta.concrete_model][instance.pk].append(instance)
+            instance._attachments_cache = defaultdict(list)
+
+        content_types = ContentType.objects.get_for_models(*by_model) if by_model else {}
+        querysets = []
+        for model, owners in by_model.items():
+            attachments = (Attachment.objects.filter(content_type=content_types[model], object_id__in=owners)
+                           .select_related("blob").order_by("object_id", "order"))
+            querysets.append((owners, attachments.prefetch_related("renditions") if renditions else attachments))
+        return querysets
+
+    @staticmethod
+    def _add_prefetched_attachment(owners, attachment):
+        instances = owners[attachment.object_id]
+        attachment._state.fields_cache["content_object"] = instances[0]
+        for instance in instances:
+            instance._attachments_cache[attachment.file_type].append(attachment)
+
+    def clear_attachments_cache(self):
+        self.__dict__.pop("_attachments_cache", None)
+        getattr(self, "_prefetched_objects_cache", {}).pop("attachments", None)
+
+    def get_prefetched_attachments(self):
+        if (cached := getattr(self, "_attachments_cache", None)) is not None:
+            return cached
+
+        if (prefetched := getattr(self, "_prefetched_objects_cache", {}).get("attachments")) is not None:
+            self._attachments_cache = defaultdict(list)
+            for attachment in sorted(prefetched, key=lambda attachment: attachment.order):
+                self._attachments_cache[attachment.file_type].append(attachment)
+            return self._attachments_cache
+        return None
 
+    def get_attachments_by_type(self, file_type=None):
+        # 미리 읽어 둔 첨부 파일이 있든 없든 order 순 리스트를 반환
+        if (cached := self.get_prefetched_attachments()) is not None:
+            if file_type:
+                return list(cached.get(file_type, []))
+            return sorted((attachment for group in cached.values() for attachment in group),
+                          key=lambda attachment: attachment.order)
+        return list(self._attachments_queryset(file_type))
+
+    def get_first_attachment(self, file_type=None):
+        if self.get_prefetched_attachments() is not None:
+            attachments = self.get_attachments_by_type(file_type)
+            return attachments[0] if attachments else None
+        return self._attachments_queryset(file_type).first()
+
+    def _attachments_queryset(self, file_type=None):
+        attachments = self.attachments.select_related("blob").order_by("order", "pk")
         if file_type:
             return attachments.filter(file_type=file_type)
-
         return attachments
 
     @property
@@ -286,26 +520,40 @@ class User(AbstractUser, BaseModel, AttachmentMixin):
     class Meta:
         ordering = ["-created"]
 
+    # 게시물 목록에서 작성자 표시에 필요한 열
+    LIST_FIELDS = ["email"]
+
     def __str__(self):
         return self.email
 
     @property
     def profile_image(self):
-        images = self.get_attachments_by_type(file_type=FileType.IMAGE)
-        return images.filter().first()
+        return self.get_first_attachment(FileType.IMAGE)
 
     def set_profile_image(self, file, **kwargs):
         return set_image(self, "profile_image", file, **kwargs)
 
 
 class Category(BaseModel, AttachmentMixin):
+    PATH_SEPARATOR = "/"
+
     name = models.CharField(max_length=200)
     slug = models.SlugField(max_length=100, unique=True)
     parent = models.ForeignKey("self", on_delete=models.CASCADE,
                                null=True, blank=True, related_name="children", verbose_name=_("상위 카테고리"))
+    # 루트부터 자신까지의 pk 를 이어 붙인 경로 (예: "1/5/9/")
+    path = models.CharField(_("경로"), max_length=255, blank=True, editable=False, db_index=True)
+    depth = models.PositiveSmallIntegerField(_("깊이"), default=0, editable=False)
+
+    # 게시물 목록에서 카테고리 표시(full_path)와 조각 캐시 키에 필요한 열
+    LIST_FIELDS = ["name", "slug", "parent", "path", "depth", "updated"]
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # API 목록의 created 커서 페이지네이션
+            models.Index(fields=["created"], condition=Q(is_active=True), name="category_active_created_idx"),
+        ]
 
     def __str__(self):
         return self.full_path
@@ -313,19 +561,116 @@ class Category(BaseModel, AttachmentMixin):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "parent" not in update_fields:
+            return super().save(*args, **kwargs)
+
+        parent = Category.all_objects.filter(pk=self.parent_id).values("path", "depth").first()
+        if parent and self.path and parent["path"].startswith(self.path):
+            raise ValidationError(_("하위 카테고리를 상위 카테고리로 지정할 수 없습니다."))
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._update_path(parent)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.clear_path_cache()
+
+    def clear_path_cache(self):
+        # ancestors, leaf 로 채운 값은 이동이나 상위 카테고리 이름 변경 후 다시 읽어야 함
+        self.__dict__.pop("_ancestors", None)
+        self.__dict__.pop("_leaf", None)
+
+    def _update_path(self, parent):
+        old_path = self.path
+        path = f"{parent['path'] if parent else ''}{self.pk}{self.PATH_SEPARATOR}"
+        depth = parent["depth"] + 1 if parent else 0
+        if path == old_path:
+            return
+
+        Category.all_objects.filter(pk=self.pk).update(path=path, depth=depth)
+        if old_path:
+            # 이동한 경우 하위 카테고리의 경로 접두사를 한 번의 UPDATE 로 교체
+            Category.all_objects.filter(self._descendant_range(old_path)).update(
+                path=Concat(Value(path), Substr("path", len(old_path) + 1)),
+                depth=F("depth") + depth - self.depth,
+            )
+        self.path, self.depth = path, depth
+        self.clear_path_cache()
+
+    @classmethod
+    def _descendant_range(cls, path):
+        # "1/5/" 의 하위 경로는 모두 "1/5/" 보다 크고 "1/50" 보다 작으므로 path 인덱스 범위 탐색이 가능
+        return Q(path__gt=path, path__lt=f"{path[:-1]}{chr(ord(cls.PATH_SEPARATOR) + 1)}")
+
+    def subtree_filter(self, prefix=""):
+        # 자신과 모든 하위 카테고리 (path 인덱스 범위 탐색)
+        return Q(**{
+            f"{prefix}path__gte": self.path,
+            f"{prefix}path__lt": f"{self.path[:-1]}{chr(ord(self.PATH_SEPARATOR) + 1)}",
+        })
+
+    @property
+    def ancestor_ids(self):
+        return [int(pk) for pk in self.path.split(self.PATH_SEPARATOR)[:-2]]
+
+    @property
+    def ancestors(self):
+        if not hasattr(self, "_ancestors"):
+            self._ancestors = list(Category.all_objects.filter(pk__in=self.ancestor_ids).order_by("depth"))
+        return self._ancestors
+
+    @property
+    def descendants(self):
+        return Category.objects.filter(self._descendant_range(self.path)).order_by("path")
 
     @property
     def full_path(self):
-        return f"{self.parent.full_path} > {self.name}" if self.parent else self.name
+        if not self.path:
+            return f"{self.parent.full_path} > {self.name}" if self.parent else self.name
+        return " > ".join([ancestor.name for ancestor in self.ancestors] + [self.name])
 
     @property
     def leaf(self):
-        return not self.children.exists()
+        if not hasattr(self, "_leaf"):
+            self._leaf = not self.children.exists()
+        return self._leaf
+
+    @classmethod
+    def fill_paths(cls, categories):
+        # 목록 페이지의 카테고리들에 대해 조상과 leaf 여부를 한꺼번에 채움 (쿼리 2회)
+        categories = [category for category in categories if category is not None]
+        if not categories:
+            return categories
+
+        ancestor_ids = {pk for category in categories for pk in category.ancestor_ids}
+        ancestors = cls.all_objects.in_bulk(ancestor_ids)
+        parent_ids = set(cls.objects.filter(parent__in=categories).values_list("parent", flat=True))
+        return cls._set_paths(categories, ancestors, parent_ids)
+
+    @classmethod
+    async def afill_paths(cls, categories):
+        categories = [category for category in categories if category is not None]
+        if not categories:
+            return categories
+
+        ancestor_ids = {pk for category in categories for pk in category.ancestor_ids}
+        ancestors = await cls.all_objects.ain_bulk(ancestor_ids)
+        parent_ids = {pk async for pk in cls.objects.filter(parent__in=categories).values_list("parent", flat=True)}
+        return cls._set_paths(categories, ancestors, parent_ids)
+
+    @staticmethod
+    def _set_paths(categories, ancestors, parent_ids):
+        for category in categories:
+            category._ancestors = [ancestors[pk] for pk in category.ancestor_ids if pk in ancestors]
+            category._leaf = category.pk not in parent_ids
+        return categories
 
     @property
     def image(self):
-        return self.get_attachments_by_type(FileType.IMAGE).first()
+        return self.get_first_attachment(FileType.IMAGE)
 
     def set_image(self, file, **kwargs):
         return set_image(self, "image", file, **kwargs)
@@ -343,17 +688,48 @@ class Post(BaseModel):
     category = models.ForeignKey("Category", null=True, on_delete=models.SET_NULL,
                                  related_name="posts", verbose_name="카테고리")
     views = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(_("댓글 수"), default=0, editable=False)
     type = models.CharField(max_length=30, choices=PostType.choices, null=False, default=PostType.POST)
 
+    # 저장 시 Markdown 을 미리 렌더링한 결과
+    content_html = models.TextField(_("렌더링된 본문"), blank=True, editable=False)
+    toc = models.TextField(_("목차"), blank=True, editable=False)
+    excerpt = models.CharField(_("요약"), max_length=255, blank=True, editable=False)
+    reading_time = models.PositiveSmallIntegerField(_("읽는 시간(분)"), default=0, editable=False)
+    render_version = models.CharField(_("렌더러 버전"), max_length=20, blank=True, editable=False)
+
+    RENDERED_FIELDS = ["content_html", "toc", "excerpt", "reading_time", "render_version"]
+    # 목록 템플릿, 행 조각 캐시 키, 커서 페이지네이션에 필요한 열 (content 같은 큰 열은 제외)
+    LIST_FIELDS = ["title", "type", "created", "updated", "comments_count", "excerpt", "render_version",
+                   "category", "author"]
+
     class Meta:
         ordering = ["-created"]
         indexes = [
             models.Index(fields=["-created"]),
+            # 유형별 목록, 개수, 커서 페이지네이션. 역방향 탐색으로 (-created, -id) 정렬을 처리함
+            models.Index(fields=["type", "created"], condition=Q(is_active=True), name="post_active_type_idx"),
+            # 목록 검증자의 유형별 MAX(updated)
+            models.Index(fields=["type", "updated"], condition=Q(is_active=True), name="post_active_updated_idx"),
         ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+    def render_content(self):
+        from .rendering import get_renderer_version, render_markdown
+        for field, value in render_markdown(self.content).items():
+            setattr(self, field, value)
+        self.render_version = get_renderer_version()
+
 
 class Comment(BaseModel):
     content = models.TextField()
@@ -365,6 +741,8 @@ class Comment(BaseModel):
         ordering = ["created"]
         indexes = [
             models.Index(fields=["created"]),
+            # 게시물별 댓글 트리를 created, id 순으로 읽을 때 정렬 없이 사용
+            models.Index(fields=["post", "created"], condition=Q(is_active=True), name="comment_active_post_idx"),
         ]
 
     def __str__(self):
@@ -0,0 +1,145 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+COUNT_CACHE_TIMEOUT = 60
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def encode_cursor(created, pk, number):
+    payload = json.dumps([created.isoformat(), pk, number], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, pk, number = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created), int(pk), int(number)
+    except (TypeError, ValueError):
+        raise InvalidCursor(_("잘못된 커서입니다."))
+
+
+class CachedCountPaginator(Paginator):
+    # COUNT(*) 결과를 캐시에 저장해 페이지 번호 계산에 근사값으로 사용
+    def __init__(self, object_list, per_page, count_cache_key=None, count_timeout=COUNT_CACHE_TIMEOUT, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_cache_key = count_cache_key
+        self.count_timeout = count_timeout
+
+    @cached_property
+    def count(self):
+        if not self.count_cache_key:
+            return super().count
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.count_cache_key, count, self.count_timeout)
+        return count
+
+    async def aprime_count(self):
+        # 비동기 뷰에서 count 를 미리 채워 이후 동기 속성 접근이 쿼리를 실행하지 않도록 함
+        count = await cache.aget(self.count_cache_key) if self.count_cache_key else None
+        if count is None:
+            count = await self.object_list.acount()
+            if self.count_cache_key:
+                await cache.aset(self.count_cache_key, count, self.count_timeout)
+        self.__dict__["count"] = count
+        return count
+
+
+class CursorPage:
+    def __init__(self, object_list, number, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage {self.number}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor(last.created, last.pk, self.number + 1)
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        first = self.object_list[0]
+        return encode_cursor(first.created, first.pk, -(self.number - 1))
+
+
+class CursorPaginator:
+    # (created, id) 키셋 페이지네이션. COUNT, OFFSET 쿼리를 실행하지 않음
+    # 커서의 번호가 음수이면 이전 페이지 방향을 의미
+    def __init__(self, object_list, per_page, count_cache_key=None, count_timeout=COUNT_CACHE_TIMEOUT):
+        self.object_list = object_list.order_by("-created", "-pk")
+        self.per_page = int(per_page)
+        self.count_cache_key = count_cache_key
+        self.count_timeout = count_timeout
+
+    def page(self, cursor=None):
+        queryset, number = self._query(cursor)
+        return self._build_page(list(queryset), number, cursor)
+
+    async def apage(self, cursor=None):
+        queryset, number = self._query(cursor)
+        return self._build_page([row async for row in queryset], number, cursor)
+
+    def _query(self, cursor):
+        if not cursor:
+            return self.object_list[:self.per_page + 1], 1
+
+        created, pk, number = decode_cursor(cursor)
+        if number > 0:
+            queryset = self.object_list.filter(Q(created__lt=created) | Q(created=created, pk__lt=pk))
+        else:
+            queryset = self.object_list.filter(Q(created__gt=created) | Q(created=created, pk__gt=pk))\
+                .order_by("created", "pk")
+        return queryset[:self.per_page + 1], number
+
+    def _build_page(self, rows, number, cursor):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if number > 0:
+            return CursorPage(rows, number, self, has_more, bool(cursor))
+        return CursorPage(rows[::-1], max(-number, 1), self, True, has_more)
+
+    @cached_property
+    def approximate_paginator(self):
+        return CachedCountPaginator(self.object_list, self.per_page,
+                                    count_cache_key=self.count_cache_key, count_timeout=self.count_timeout)
+
+    def get_elided_page_range(self, number=1, **kwargs):
+        paginator = self.approximate_paginator
+        return paginator.get_elided_page_range(number=min(number, paginator.num_pages), **kwargs)
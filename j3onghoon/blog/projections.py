@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models.query import BaseIterable, ValuesListIterable
+
+from .models import Category, Post, User
+
+
+# 목록 행에서 함께 읽는 관계: 필드 이름 -> 모델
+ROW_RELATIONS = {"category": Category, "author": User}
+
+POST_ROW_FIELDS = ["pk", *(field for field in Post.LIST_FIELDS if field not in ROW_RELATIONS)]
+
+
+def relation_row_fields(model):
+    # Model.from_db 는 값이 모델의 필드 순서대로 오기를 기대하므로 필드 정의 순서로 정렬
+    return [field.attname for field in model._meta.concrete_fields
+            if field.primary_key or field.name in model.LIST_FIELDS]
+
+
+RELATION_ROW_FIELDS = {name: relation_row_fields(model) for name, model in ROW_RELATIONS.items()}
+
+
+def list_projection(queryset):
+    # 목록에 필요한 열만 읽는 모델 인스턴스 쿼리셋
+    return queryset.select_related(*ROW_RELATIONS).only(*Post.LIST_FIELDS, *(
+        f"{name}__{field}" for name, model in ROW_RELATIONS.items() for field in model.LIST_FIELDS
+    ))
+
+
+@dataclass(slots=True)
+class PostRow:
+    pk: int
+    title: str
+    type: str
+    created: datetime
+    updated: datetime
+    comments_count: int
+    excerpt: str
+    render_version: str
+    category: Category | None = None
+    author: User | None = None
+    # 목록 템플릿에서 채우거나 읽는 값
+    row_html: str = ""
+    search_snippet: str = ""
+
+
+class PostRowIterable(BaseIterable):
+    # 게시물마다 모델 인스턴스를 만들지 않고 PostRow 로 반환. 카테고리와 작성자는 id 별로 한 번만 만들어 공유
+    def __iter__(self):
+        db = self.queryset.db
+        instances = {name: {} for name in ROW_RELATIONS}
+        for values in ValuesListIterable(self.queryset, self.chunked_fetch, self.chunk_size):
+            related = {}
+            offset = len(POST_ROW_FIELDS)
+            for name, model in ROW_RELATIONS.items():
+                fields = RELATION_ROW_FIELDS[name]
+                pk = values[offset]
+                if pk is not None and pk not in instances[name]:
+                    instances[name][pk] = model.from_db(db, fields, values[offset:offset + len(fields)])
+                related[name] = instances[name].get(pk)
+                offset += len(fields)
+            yield PostRow(*values[:len(POST_ROW_FIELDS)], **related)
+
+
+def post_rows(queryset):
+    # 필터, 정렬, 슬라이싱, count() 는 그대로 쓸 수 있고 평가할 때만 PostRow 를 만듦
+    queryset = queryset.values_list(*POST_ROW_FIELDS, *(
+        f"{name}__{field}" for name, fields in RELATION_ROW_FIELDS.items() for field in fields
+    ))
+    queryset._iterable_class = PostRowIterable
+    return queryset
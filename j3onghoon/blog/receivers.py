@@ -0,0 +1,216 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import search
+from .archives import adjust_post_counts, category_post_counts, post_count_rows
+from .cache import bump_generation
+from .feeds import SITEMAP_GENERATION, sitemap_segment, sitemap_segment_generation
+from .fragments import CATEGORY_GENERATION, PROFILE_IMAGE_GENERATION
+from .models import Attachment, Category, Comment, FileDeletion, Post, Rendition, User
+from .renditions import invalidate_renditions, schedule_renditions
+from .signals import restored, soft_deleted
+
+
+def update_comments_count(counts, sign):
+    for post_id, count in counts:
+        Post.all_objects.filter(pk=post_id).update(comments_count=F("comments_count") + sign * count)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_type(sender, instance, raw=False, update_fields=None, **kwargs):
+    # 유형이 바뀌면 이전 유형의 목록에서도 빠지므로 저장 전 유형을 기록해 두 유형 모두 무효화
+    if raw or instance._state.adding or (update_fields is not None and "type" not in update_fields):
+        return
+    instance._previous_type = Post.all_objects.filter(pk=instance.pk).values_list("type", flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    previous_type = instance.__dict__.pop("_previous_type", None)
+    bump_generation(*filter(None, [instance.type, previous_type]))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_sitemap(sender, instance, **kwargs):
+    bump_generation(SITEMAP_GENERATION, sitemap_segment_generation(sitemap_segment(instance.pk)))
+
+
+@receiver(soft_deleted, sender=Post)
+@receiver(restored, sender=Post)
+def invalidate_bulk_sitemap(sender, pks, **kwargs):
+    bump_generation(SITEMAP_GENERATION, *(sitemap_segment_generation(sitemap_segment(pk)) for pk in pks))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(soft_deleted, sender=Category)
+@receiver(restored, sender=Category)
+def invalidate_category_fragments(sender, **kwargs):
+    # 카테고리 이름이나 위치가 바뀌면 하위 카테고리의 full_path 도 바뀌므로 모든 행 조각과 목록 페이지를 무효화
+    bump_generation(CATEGORY_GENERATION, *Post.PostType.values)
+    category_post_counts.invalidate()
+
+
+COUNTED_POST_FIELDS = {"type", "category"}
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_counts(sender, instance, raw=False, update_fields=None, **kwargs):
+    # 유형이나 카테고리가 바뀌는 저장이면 저장 전 상태를 기록해 post_save 에서 개수 차이만 반영
+    if raw or (update_fields is not None and not COUNTED_POST_FIELDS & set(update_fields)):
+        return
+    instance._counted_rows = [] if instance._state.adding else post_count_rows([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def update_post_counts(sender, instance, **kwargs):
+    if (before := instance.__dict__.pop("_counted_rows", None)) is None:
+        return
+    after = post_count_rows([instance.pk])
+    if before != after:
+        adjust_post_counts(before, -1)
+        adjust_post_counts(after, 1)
+
+
+@receiver(post_delete, sender=Post)
+def decrease_post_counts(sender, instance, **kwargs):
+    if instance.is_active:
+        path = Category.all_objects.filter(pk=instance.category_id).values_list("path", flat=True).first()
+        adjust_post_counts([(instance.type, path, instance.created)], -1)
+
+
+@receiver(soft_deleted, sender=Post)
+@receiver(restored, sender=Post)
+def update_bulk_post_counts(sender, pks, signal, **kwargs):
+    adjust_post_counts(post_count_rows(pks, Post.all_objects), -1 if signal is soft_deleted else 1)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw=False, update_fields=None, **kwargs):
+    # 다른 게시물로 옮기면 두 게시물의 댓글 수와 페이지를 모두 갱신하도록 저장 전 게시물을 기록
+    instance._previous_post_id = None
+    if raw or instance._state.adding or (update_fields is not None and "post" not in update_fields):
+        return
+    instance._previous_post_id = Comment.all_objects.filter(pk=instance.pk).values_list("post", flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    post_ids = {instance.post_id, getattr(instance, "_previous_post_id", None)} - {None}
+    bump_generation(*Post.all_objects.filter(pk__in=post_ids).values_list("type", flat=True))
+
+
+@receiver(soft_deleted, sender=Post)
+@receiver(restored, sender=Post)
+def invalidate_bulk_post_pages(sender, pks, **kwargs):
+    bump_generation(*Post.all_objects.filter(pk__in=pks).values_list("type", flat=True).distinct())
+
+
+@receiver(soft_deleted, sender=Comment)
+@receiver(restored, sender=Comment)
+def invalidate_bulk_comment_pages(sender, pks, **kwargs):
+    bump_generation(*Post.all_objects.filter(comments__pk__in=pks).values_list("type", flat=True).distinct())
+
+
+@receiver(post_save, sender=Comment)
+def increase_comments_count(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.is_active:
+        return
+    if created:
+        update_comments_count([(instance.post_id, 1)], 1)
+    elif (previous := getattr(instance, "_previous_post_id", None)) not in (None, instance.post_id):
+        update_comments_count([(previous, 1)], -1)
+        update_comments_count([(instance.post_id, 1)], 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comments_count(sender, instance, **kwargs):
+    if instance.is_active:
+        update_comments_count([(instance.post_id, 1)], -1)
+
+
+@receiver(soft_deleted, sender=Comment)
+@receiver(restored, sender=Comment)
+def update_bulk_comments_count(sender, pks, signal, **kwargs):
+    counts = Comment.all_objects.filter(pk__in=pks).values_list("post").annotate(count=Count("pk")).order_by()
+    update_comments_count(counts, -1 if signal is soft_deleted else 1)
+
+
+@receiver(post_save, sender=Attachment)
+def create_renditions(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and getattr(settings, "BLOG_EAGER_RENDITIONS", True):
+        transaction.on_commit(lambda: schedule_renditions(instance))
+
+
+@receiver(soft_deleted, sender=Attachment)
+def invalidate_attachment_renditions(sender, pks, **kwargs):
+    invalidate_renditions(pks)
+
+
+@receiver(post_save, sender=Attachment)
+@receiver(post_delete, sender=Attachment)
+@receiver(soft_deleted, sender=Attachment)
+@receiver(restored, sender=Attachment)
+def invalidate_profile_images(sender, instance=None, **kwargs):
+    # 작성자 프로필 이미지는 목록과 상세 페이지에 표시되므로 사용자 첨부 파일이 바뀌면 페이지 캐시와 ETag 를 무효화
+    # 일괄 시그널은 소유자를 알 수 없으므로 항상 무효화
+    if instance is None or instance.content_type_id == ContentType.objects.get_for_model(User).pk:
+        bump_generation(PROFILE_IMAGE_GENERATION, *Post.PostType.values)
+
+
+@receiver(post_save, sender=Rendition)
+@receiver(post_delete, sender=Rendition)
+def invalidate_profile_image_renditions(sender, instance, raw=False, **kwargs):
+    # 변환본이 생기거나 지워지면 프로필 이미지 URL 이 바뀜
+    if raw:
+        return
+    content_type_id = (Attachment.all_objects.filter(pk=instance.attachment_id)
+                       .values_list("content_type_id", flat=True).first())
+    if content_type_id is None or content_type_id == ContentType.objects.get_for_model(User).pk:
+        bump_generation(PROFILE_IMAGE_GENERATION, *Post.PostType.values)
+
+
+@receiver(post_delete, sender=Rendition)
+def delete_rendition_file(sender, instance, **kwargs):
+    FileDeletion.enqueue(instance.file)
+
+
+@receiver(post_delete, sender=Attachment)
+def delete_attachment_file(sender, instance, **kwargs):
+    if instance.blob_id:
+        instance.blob.release()
+    else:
+        FileDeletion.enqueue(instance.file)
+
+
+@receiver(post_save, sender=Post)
+@receiver(soft_deleted, sender=Post)
+@receiver(restored, sender=Post)
+def index_posts(sender, instance=None, pks=None, raw=False, **kwargs):
+    if not raw:
+        search.index_posts([instance.pk] if pks is None else pks)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(soft_deleted, sender=Comment)
+@receiver(restored, sender=Comment)
+def index_comments(sender, instance=None, pks=None, raw=False, **kwargs):
+    if not raw:
+        search.index_comments([instance.pk] if pks is None else pks)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_index(sender, instance, **kwargs):
+    search.remove("post", [instance.pk])
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_from_index(sender, instance, **kwargs):
+    search.remove("comment", [instance.pk])
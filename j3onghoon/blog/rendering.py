@@ -0,0 +1,72 @@
+import hashlib
+import html
+import json
+import math
+import re
+
+from django.utils.html import strip_tags
+
+
+# 렌더러 동작을 바꾸면 올려서 rerender_posts 가 기존 게시물을 다시 렌더링하도록 함
+RENDERER_REVISION = 2
+# "extra" 의 하위 확장 중 임의 HTML 속성을 허용하는 attr_list 와 원본 HTML 용 md_in_html 은 제외
+MARKDOWN_EXTENSIONS = ["fenced_code", "footnotes", "def_list", "tables", "abbr", "codehilite", "toc", "sane_lists"]
+MARKDOWN_EXTENSION_CONFIGS = {
+    "codehilite": {"noclasses": True, "pygments_style": "monokai", "guess_lang": False},
+    "toc": {"permalink": False, "toc_depth": "2-4"},
+}
+# 한글 제목의 앵커가 비지 않도록 markdown.extensions.toc 의 유니코드 slugify 사용
+TOC_SLUGIFY = "slugify_unicode"
+SAFE_URL_SCHEMES = ("http:", "https:", "mailto:", "#", "/")
+# 브라우저는 URL 의 공백과 제어 문자를 무시하고 스킴을 해석함
+URL_IGNORED_CHARS_RE = re.compile(r"[\x00-\x20\x7f]+")
+EXCERPT_LENGTH = 200
+READING_CHARS_PER_MINUTE = 500
+
+
+def get_renderer_version():
+    import markdown
+    import pygments
+
+    config = json.dumps([RENDERER_REVISION, markdown.__version__, pygments.__version__,
+                         MARKDOWN_EXTENSIONS, MARKDOWN_EXTENSION_CONFIGS, TOC_SLUGIFY], sort_keys=True)
+    return hashlib.md5(config.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def unsafe_link_treeprocessor(md):
+    from markdown.treeprocessors import Treeprocessor
+
+    class Processor(Treeprocessor):
+        # javascript: 등 허용하지 않은 스킴의 링크와 이미지 주소를 제거
+        def run(self, root):
+            for element in root.iter():
+                if element.tag not in ("a", "img"):
+                    continue
+                attribute = "href" if element.tag == "a" else "src"
+                # 문자 참조(&#58; 등)를 풀고 공백, 제어 문자를 지운 뒤 스킴을 확인
+                url = URL_IGNORED_CHARS_RE.sub("", html.unescape(element.get(attribute, ""))).lower()
+                if url and ":" in url.split("/")[0] and not url.startswith(SAFE_URL_SCHEMES):
+                    element.set(attribute, "")
+
+    return Processor(md)
+
+
+def render_markdown(content):
+    # 워커 프로세스에서도 호출되므로 ORM 없이 문자열만 다룸
+    import markdown
+    from markdown.extensions import toc
+
+    configs = {**MARKDOWN_EXTENSION_CONFIGS, "toc": {**MARKDOWN_EXTENSION_CONFIGS["toc"], "slugify": getattr(toc, TOC_SLUGIFY)}}
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, extension_configs=configs)
+    # 방명록 등 사용자가 작성한 본문이므로 원본 HTML 은 허용하지 않음
+    md.preprocessors.deregister("html_block")
+    md.inlinePatterns.deregister("html")
+    md.treeprocessors.register(unsafe_link_treeprocessor(md), "unsafe_links", 0)
+    content_html = md.convert(content)
+    text = " ".join(html.unescape(strip_tags(content_html)).split())
+    return {
+        "content_html": content_html,
+        "toc": md.toc if md.toc_tokens else "",
+        "excerpt": text if len(text) <= EXCERPT_LENGTH else f"{text[:EXCERPT_LENGTH - 1].rstrip()}…",
+        "reading_time": max(1, math.ceil(len(text) / READING_CHARS_PER_MINUTE)),
+    }
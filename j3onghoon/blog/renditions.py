@@ -0,0 +1,116 @@
+import io
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, close_old_connections
+
+from .models import Attachment, FileType, Rendition
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RENDITIONS = {
+    "thumbnail": {"size": (320, 320), "format": "JPEG", "quality": 80},
+    "webp": {"size": (1280, 1280), "format": "WEBP", "quality": 80},
+    "thumbnail_webp": {"size": (320, 320), "format": "WEBP", "quality": 75},
+}
+FORMAT_EXTENSIONS = {"JPEG": ("jpg", "image/jpeg"), "WEBP": ("webp", "image/webp"), "PNG": ("png", "image/png")}
+
+_executor = None
+_pending = set()
+_lock = threading.Lock()
+
+
+def get_specs():
+    return getattr(settings, "BLOG_RENDITIONS", DEFAULT_RENDITIONS)
+
+
+def get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=getattr(settings, "BLOG_RENDITION_WORKERS", 2))
+        return _executor
+
+
+def render_image(data, size, format, quality):
+    # 워커 프로세스에서 실행되므로 Django ORM 없이 bytes 만 주고받음
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size)
+        if format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        output = io.BytesIO()
+        image.save(output, format=format, quality=quality)
+        return output.getvalue(), image.width, image.height
+
+
+def get_rendition(attachment, name):
+    # prefetch_attachments(..., renditions=True) 로 읽어 둔 변환본이 있으면 쿼리하지 않음
+    prefetched = getattr(attachment, "_prefetched_objects_cache", {}).get("renditions")
+    if prefetched is not None:
+        rendition = next((rendition for rendition in prefetched if rendition.name == name), None)
+    else:
+        rendition = Rendition.objects.filter(attachment=attachment, name=name).first()
+    if rendition is None and getattr(settings, "BLOG_GENERATE_MISSING_RENDITIONS", True):
+        schedule_renditions(attachment, [name])
+    return rendition
+
+
+def schedule_renditions(attachment, names=None):
+    if attachment.file_type != FileType.IMAGE or attachment.extension == "svg":
+        return
+
+    specs = get_specs()
+    for name in names or specs:
+        key = (attachment.pk, name)
+        with _lock:
+            if key in _pending:
+                continue
+            _pending.add(key)
+
+        try:
+            with attachment.file.open("rb") as source:
+                data = source.read()
+            spec = specs[name]
+            future = get_executor().submit(render_image, data, spec["size"], spec["format"], spec.get("quality", 80))
+        except Exception:
+            logger.exception("이미지 변환 예약 실패 (ID: %s, 규격: %s)", attachment.pk, name)
+            _pending.discard(key)
+            continue
+        future.add_done_callback(lambda future, pk=attachment.pk, name=name: _save_rendition(future, pk, name))
+
+
+def _save_rendition(future, attachment_pk, name):
+    # 실행자 내부 스레드에서 호출되므로 DB 연결을 직접 정리
+    close_old_connections()
+    try:
+        content, width, height = future.result()
+        attachment = Attachment.objects.filter(pk=attachment_pk).first()
+        if attachment is None:
+            return
+
+        extension, mime_type = FORMAT_EXTENSIONS[get_specs()[name]["format"]]
+        rendition = Rendition(attachment=attachment, name=name, mime_type=mime_type,
+                              width=width, height=height, size=len(content))
+        rendition.file.save(f"renditions/{attachment.pk}/{name}.{extension}", ContentFile(content), save=False)
+        try:
+            rendition.save()
+        except IntegrityError:
+            rendition.file.storage.delete(rendition.file.name)
+    except Exception:
+        logger.exception("이미지 변환 실패 (ID: %s, 규격: %s)", attachment_pk, name)
+    finally:
+        _pending.discard((attachment_pk, name))
+        close_old_connections()
+
+
+def invalidate_renditions(attachment_pks):
+    # 행을 하나씩 삭제해 post_delete 에서 저장소 파일도 지우도록 함
+    for rendition in Rendition.objects.filter(attachment__in=attachment_pks):
+        rendition.delete()
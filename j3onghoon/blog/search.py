@@ -0,0 +1,160 @@
+from django.db import connection, transaction
+from django.db.models import Q, Value
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Comment, Post
+
+
+SEARCH_TABLE = "blog_search_index"
+# rebuild 가 새 색인을 만드는 동안 사용하는 테이블. 완성되면 SEARCH_TABLE 과 교체
+SHADOW_TABLE = "blog_search_index_new"
+SEARCH_COLUMNS = ("title, content, kind UNINDEXED, object_id UNINDEXED, post_id UNINDEXED, post_type UNINDEXED, "
+                  "tokenize = 'trigram'")
+SEARCH_LIMIT = 200
+SNIPPET_TOKENS = 16
+# trigram 토크나이저는 3글자 미만 검색어를 MATCH 로 찾을 수 없어 LIKE 로 대체
+TRIGRAM_LENGTH = 3
+# 스니펫 강조 표시용 문자. 본문을 이스케이프한 뒤 <mark> 로 바꿈
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_END = "\ue001"
+
+
+def search_enabled():
+    return connection.vendor == "sqlite"
+
+
+def _replace(kind, rows, table=SEARCH_TABLE):
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {table} WHERE kind = %s AND object_id = %s",
+                           [(kind, row[0]) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {table} (title, content, kind, object_id, post_id, post_type) "
+            f"VALUES (%s, %s, %s, %s, %s, %s)",
+            [(title, content, kind, pk, post_id, post_type) for pk, title, content, post_id, post_type in rows],
+        )
+
+
+def remove(kind, pks, table=SEARCH_TABLE):
+    if not search_enabled() or not pks:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {table} WHERE kind = %s AND object_id = %s",
+                           [(kind, pk) for pk in pks])
+
+
+def index_posts(pks, table=SEARCH_TABLE):
+    if not search_enabled():
+        return
+    posts = Post.all_objects.filter(pk__in=pks)
+    remove("post", list(posts.filter(is_active=False).values_list("pk", flat=True)), table)
+    _replace("post", posts.filter(is_active=True).values_list("pk", "title", "content", "pk", "type"), table)
+
+
+def index_comments(pks, table=SEARCH_TABLE):
+    if not search_enabled():
+        return
+    comments = Comment.all_objects.filter(pk__in=pks)
+    remove("comment", list(comments.filter(is_active=False).values_list("pk", flat=True)), table)
+    _replace("comment", comments.filter(is_active=True)
+             .values_list("pk", Value(""), "content", "post_id", "post__type"), table)
+
+
+def rebuild(batch_size=500, stdout=None):
+    # 새 테이블에 배치 단위로 색인한 뒤 한 트랜잭션에서 교체하므로 재색인 중에도 기존 색인으로 검색됨
+    if not search_enabled():
+        return 0
+    started = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+        cursor.execute(f"CREATE VIRTUAL TABLE {SHADOW_TABLE} USING fts5({SEARCH_COLUMNS})")
+
+    indexed = 0
+    for model, index in ((Post, index_posts), (Comment, index_comments)):
+        last_pk = 0
+        while pks := list(model.objects.filter(pk__gt=last_pk).order_by("pk")
+                          .values_list("pk", flat=True)[:batch_size]):
+            with transaction.atomic():
+                index(pks, SHADOW_TABLE)
+            indexed += len(pks)
+            last_pk = pks[-1]
+            if stdout:
+                stdout.write(f"{model._meta.verbose_name}: {last_pk}까지 색인했습니다.")
+
+    with transaction.atomic():
+        # 재색인 중 기존 색인에만 반영된 변경(수정, 소프트 삭제, 복원)을 새 색인에 다시 반영한 뒤 교체
+        changed = Q(updated__gte=started) | Q(deleted__gte=started)
+        index_posts(list(Post.all_objects.filter(changed).values_list("pk", flat=True)), SHADOW_TABLE)
+        index_comments(list(Comment.all_objects.filter(changed).values_list("pk", flat=True)), SHADOW_TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {SEARCH_TABLE}")
+            cursor.execute(f"ALTER TABLE {SHADOW_TABLE} RENAME TO {SEARCH_TABLE}")
+    return indexed
+
+
+def _like_snippet(text, query, width=40):
+    index = text.lower().find(query.lower())
+    start = max(index - width, 0)
+    end = index + len(query)
+    return "".join([
+        "…" if start else "",
+        text[start:index],
+        HIGHLIGHT_START, text[index:end], HIGHLIGHT_END,
+        text[end:end + width],
+        "…" if end + width < len(text) else "",
+    ])
+
+
+def _highlight(snippet):
+    return mark_safe(escape(snippet).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_END, "</mark>"))
+
+
+def _fallback_search(query, post_type):
+    posts = Post.objects.filter(Q(title__icontains=query) | Q(content__icontains=query))
+    if post_type:
+        posts = posts.filter(type=post_type)
+    return list(posts.select_related("category", "author")[:SEARCH_LIMIT])
+
+
+def search(query, post_type=None, limit=SEARCH_LIMIT):
+    # 게시물과 댓글 색인을 함께 검색해 게시물 단위로 묶고 bm25 순위가 가장 좋은 스니펫을 붙임
+    query = query.strip()
+    if not query:
+        return []
+    if not search_enabled():
+        return _fallback_search(query, post_type)
+
+    like = len(query) < TRIGRAM_LENGTH
+    if like:
+        # %, _ 가 와일드카드로 해석되지 않도록 이스케이프
+        pattern = "%{}%".format(query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_"))
+        condition, params = "(title LIKE %s ESCAPE '\\' OR content LIKE %s ESCAPE '\\')", [pattern] * 2
+        # LIKE 검색은 순위가 없으므로 정렬하지 않음
+        columns, rank, order = "title || ' ' || content", "0", ""
+    else:
+        condition, params = f"{SEARCH_TABLE} MATCH %s", ['"{}"'.format(query.replace('"', '""'))]
+        columns = f"snippet({SEARCH_TABLE}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', {SNIPPET_TOKENS})"
+        rank = f"bm25({SEARCH_TABLE}, 10.0, 1.0)"
+        order = " ORDER BY rank"
+    if post_type:
+        condition += " AND post_type = %s"
+        params.append(post_type)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT post_id, {columns}, {rank} AS rank FROM {SEARCH_TABLE} WHERE {condition}{order} LIMIT %s",
+            [*params, limit],
+        )
+        hits = {}
+        for post_id, snippet, rank in cursor.fetchall():
+            hits.setdefault(post_id, (_like_snippet(snippet, query) if like else snippet, rank))
+
+    posts = Post.objects.select_related("category", "author").in_bulk(hits)
+    results = []
+    for post_id, (snippet, rank) in hits.items():
+        if post := posts.get(post_id):
+            post.search_snippet = _highlight(snippet)
+            post.search_rank = rank
+            results.append(post)
+    return results
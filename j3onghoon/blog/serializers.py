@@ -0,0 +1,69 @@
+from rest_framework import serializers
+
+from .models import Category, Comment, Post
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    # Meta.default_fields: ?fields= 가 없을 때 응답할 필드 (큰 필드는 요청할 때만 포함)
+    # Meta.field_plans: 필드별로 읽어야 할 컬럼(only)과 select_related/prefetch_related 대상
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.get_requested_fields(self.context.get("request"))
+        for name in set(self.fields) - set(requested):
+            self.fields.pop(name)
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        fields = request.query_params.get("fields") if request else None
+        if not fields:
+            return list(getattr(cls.Meta, "default_fields", cls.Meta.fields))
+        return [name for name in fields.split(",") if name in cls.Meta.fields] or ["id"]
+
+    @classmethod
+    def get_query_plan(cls, requested):
+        plans = getattr(cls.Meta, "field_plans", {})
+        only, select_related, prefetch_related = {"id", "created"}, set(), set()
+        for name in requested:
+            plan = plans.get(name, {"only": [name]})
+            only.update(plan.get("only", []))
+            select_related.update(plan.get("select_related", []))
+            prefetch_related.update(plan.get("prefetch_related", []))
+        return sorted(only), sorted(select_related), sorted(prefetch_related)
+
+
+class CategorySerializer(SparseFieldsetSerializer):
+    full_path = serializers.CharField(read_only=True)
+    image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Category
+        fields = ["id", "name", "slug", "parent", "path", "depth", "full_path", "image", "created", "updated"]
+        field_plans = {
+            "full_path": {"only": ["name", "path"]},
+            # 첨부 파일은 CategoryViewSet.prepare_page 에서 페이지 단위로 한 번에 읽음
+            "image": {"only": []},
+        }
+
+    def get_image(self, category):
+        image = category.image
+        return image and self.context["request"].build_absolute_uri(image.get_absolute_url())
+
+
+class PostSerializer(SparseFieldsetSerializer):
+    category_path = serializers.CharField(source="category.full_path", default=None, read_only=True)
+
+    class Meta:
+        model = Post
+        fields = ["id", "type", "title", "content", "excerpt", "author", "category", "category_path",
+                  "views", "comments_count", "created", "updated"]
+        default_fields = ["id", "type", "title", "excerpt", "author", "category", "category_path",
+                          "views", "comments_count", "created", "updated"]
+        field_plans = {
+            "category_path": {"only": ["category"], "select_related": ["category"]},
+        }
+
+
+class CommentSerializer(SparseFieldsetSerializer):
+    class Meta:
+        model = Comment
+        fields = ["id", "post", "parent", "author", "content", "created", "updated"]
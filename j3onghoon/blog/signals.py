@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+
+# 소프트 삭제/복구는 update 로 처리되는 경우 post_save 를 발생시키지 않으므로 별도 시그널로 알림
+# 인자: pks (상태가 실제로 바뀐 객체의 pk 목록)
+soft_deleted = Signal()
+restored = Signal()
@@ -1,3 +1,879 @@
-from django.test import TestCase
+import importlib
+import json
+import re
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, connections, transaction
+from django.template.base import Template
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from j3onghoon.sqlite3.base import BUSY_RETRIES, Database, RetryingCursorWrapper
+from j3onghoon.urls import ASYNC_ROUTE_NAMES
+
+from . import search
+from .counters import ViewCountBuffer
+from .middleware import QueryInstrumentationMiddleware, RequestRecorder, fingerprint
+from .cache import page_cache_key
+from .management.commands.compare_throughput import urlconf
+from .models import Blob, Category, Comment, FileDeletion, FileType, Post, Rendition, User
+from .rendering import render_markdown
+from .renditions import render_image
+from .views import post_view_counts
+
+
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63f8cfc0f01f00050001ff89993d1d0000000049454e44ae426082"
+)
+
+
+# 개발 서버와 같은 파일 캐시를 비우지 않도록 테스트에서는 프로세스 내 캐시 사용
+LOCAL_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class BlogTestMixin:
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(
+            CACHES=LOCAL_CACHES, MEDIA_ROOT=cls.media_root,
+            BLOG_EAGER_RENDITIONS=False, BLOG_GENERATE_MISSING_RENDITIONS=False,
+        ))
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        super().setUpClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        # 조회수 버퍼가 프로세스 종료 시 테스트 DB 가 아닌 DB 에 반영되지 않도록 비움
+        post_view_counts.flush()
+
+    def create_user(self, name, image=False):
+        user = User.objects.create_user(email=f"{name}@example.com", password="password")
+        if image:
+            user.set_profile_image(ContentFile(PNG, name=f"{name}.png"))
+        return user
+
+    def create_posts(self, count, post_type=Post.PostType.POST):
+        return [Post.objects.create(title=f"{post_type} {i}", content=f"내용 {i}", type=post_type) for i in range(count)]
+
+
+# 테스트 DB 의 replica 는 default 를 가리키는 별도 연결이라 커밋 전 데이터를 볼 수 없으므로 라우터를 끔
+@override_settings(DATABASE_ROUTERS=[])
+class BlogTestCase(BlogTestMixin, TestCase):
+    pass
+
+
+class CursorPaginationTests(BlogTestCase):
+    def test_guestbook_cursor_pages(self):
+        self.create_posts(10, Post.PostType.GUESTBOOK)
+
+        response = self.client.get("/guestbooks/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "guestbook 9")
+        self.assertNotContains(response, "guestbook 1 ")
+        cursor = re.search(r"\?cursor=([\w-]+)", response.content.decode()).group(1)
+
+        response = self.client.get(f"/guestbooks/?cursor={cursor}", headers={"HX-Request": "true"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "guestbook 1 ")
+        self.assertNotContains(response, "guestbook 9")
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get("/guestbooks/?cursor=invalid").status_code, 404)
+
+    def test_portfolio_list(self):
+        self.create_posts(3, Post.PostType.PORTFOLIO)
+        self.assertContains(self.client.get("/portfolios/"), "portfolio 2")
+
+
+class PageCacheTests(BlogTestCase):
+    def test_stale_page_has_no_validators(self):
+        self.create_posts(2)
+        etag = self.client.get("/posts/")["ETag"]
+        Post.objects.create(title="새 글", content="내용")
+
+        # 다른 워커가 페이지를 다시 만드는 중이면 이전 페이지를 검증자 없이 응답
+        cache.add(f"{page_cache_key(Post.PostType.POST, 'full', '')}:lock", 1)
+        response = self.client.get("/posts/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "새 글")
+        self.assertFalse(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+        cache.delete(f"{page_cache_key(Post.PostType.POST, 'full', '')}:lock")
+        response = self.client.get("/posts/")
+        self.assertContains(response, "새 글")
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get("/posts/", headers={"If-None-Match": response["ETag"]}).status_code, 304)
+
+
+    def test_type_change_invalidates_previous_list(self):
+        post = self.create_posts(1)[0]
+        etag = self.client.get("/posts/")["ETag"]
+        self.assertNotContains(self.client.get("/portfolios/"), post.title)
+
+        post.type = Post.PostType.PORTFOLIO
+        post.save()
+        response = self.client.get("/posts/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, post.title)
+        self.assertContains(self.client.get("/portfolios/"), post.title)
+
+
+class SharedCacheCheckTests(TestCase):
+    def test_process_local_cache_warns(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            self.assertIn("blog.W001", [message.id for message in run_checks()])
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}):
+            self.assertNotIn("blog.W001", [message.id for message in run_checks()])
+
+
+class CategoryPathTests(BlogTestCase):
+    def test_full_path_after_parent_rename(self):
+        parent = Category.objects.create(name="a", slug="a")
+        child = Category.objects.create(name="b", slug="b", parent=parent)
+        self.assertEqual(child.full_path, "a > b")
+
+        parent.name = "z"
+        parent.save()
+        child.refresh_from_db()
+        self.assertEqual(child.full_path, "z > b")
+
+    def test_full_path_and_leaf_after_move(self):
+        a = Category.objects.create(name="a", slug="a")
+        b = Category.objects.create(name="b", slug="b")
+        child = Category.objects.create(name="c", slug="c", parent=a)
+        self.assertEqual(child.full_path, "a > c")
+        self.assertTrue(b.leaf)
+
+        child.parent = b
+        child.save()
+        self.assertEqual(child.full_path, "b > c")
+        b.refresh_from_db()
+        self.assertFalse(b.leaf)
+        self.assertEqual(list(b.descendants), [child])
+
+
+class AttachmentPrefetchTests(BlogTestCase):
+    def create_authored_posts(self, count, start=0):
+        for i in range(start, start + count):
+            author = self.create_user(f"author{i}", image=True)
+            post = Post.objects.create(title=f"post {i}", content="내용", author=author)
+            Comment.objects.create(post=post, author=author, content="댓글")
+        return post
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, headers={"HX-Request": "true"})
+        self.assertEqual(response.status_code, 200)
+        return len(context), response
+
+    def test_list_queries_do_not_grow_with_authors(self):
+        self.create_authored_posts(2)
+        few, response = self.count_queries("/posts/")
+        self.assertContains(response, "author1@example.com")
+        self.assertContains(response, "/attachments/")
+        self.create_authored_posts(6, start=2)
+        many, _response = self.count_queries("/posts/")
+        self.assertEqual(few, many)
+
+    def test_detail_prefetches_comment_authors(self):
+        post = self.create_authored_posts(1)
+        for i in range(3):
+            Comment.objects.create(post=post, author=self.create_user(f"commenter{i}", image=True), content="댓글")
+        few, _response = self.count_queries(f"/posts/{post.pk}")
+        for i in range(3, 6):
+            Comment.objects.create(post=post, author=self.create_user(f"commenter{i}", image=True), content="댓글")
+        many, response = self.count_queries(f"/posts/{post.pk}")
+        self.assertEqual(few, many)
+        self.assertEqual(response.content.decode().count("/attachments/"), 8)
+
+    def test_api_category_images(self):
+        for i in range(2):
+            Category.objects.create(name=f"c{i}", slug=f"c{i}").set_image(ContentFile(PNG, name=f"c{i}.png"))
+        few, _response = self.count_queries("/api/categories/")
+        for i in range(2, 6):
+            Category.objects.create(name=f"c{i}", slug=f"c{i}").set_image(ContentFile(PNG, name=f"c{i}.png"))
+        many, response = self.count_queries("/api/categories/")
+        self.assertEqual(few, many)
+        self.assertTrue(all("/attachments/" in category["image"] for category in response.json()["results"]))
+
+    def test_attachments_are_lists_with_or_without_prefetch(self):
+        user = self.create_user("owner", image=True)
+        user.add_attachment(ContentFile(b"%PDF-1.4", name="a.pdf"), file_type=FileType.DOCUMENT)
+        self.assertIsInstance(user.images, list)
+        self.assertEqual(len(user.get_attachments_by_type()), 2)
+
+        user = User.objects.get(pk=user.pk)
+        User.prefetch_attachments([user])
+        with self.assertNumQueries(0):
+            self.assertIsInstance(user.images, list)
+            self.assertEqual(user.profile_image, user.images[0])
+            self.assertEqual(len(user.documents), 1)
+
+
+class RenditionTests(BlogTestCase):
+    def create_rendition(self, attachment, name="thumbnail"):
+        content, width, height = render_image(PNG, (320, 320), "JPEG", 80)
+        rendition = Rendition(attachment=attachment, name=name, mime_type="image/jpeg",
+                              width=width, height=height, size=len(content))
+        rendition.file.save(f"renditions/{attachment.pk}/{name}.jpg", ContentFile(content), save=False)
+        rendition.save()
+        return rendition
+
+    def create_author(self, name):
+        author = self.create_user(name, image=True)
+        return author, self.create_rendition(author.profile_image)
+
+    def test_list_and_detail_serve_thumbnails(self):
+        author, rendition = self.create_author("author")
+        post = Post.objects.create(title="글", content="내용", author=author)
+        Comment.objects.create(post=post, author=author, content="댓글")
+
+        for url, count in (("/posts/", 1), (f"/posts/{post.pk}", 2)):
+            response = self.client.get(url)
+            self.assertContains(response, rendition.get_absolute_url(), count=count)
+            self.assertNotContains(response, author.profile_image.get_absolute_url())
+
+    def test_thumbnails_do_not_add_queries_per_author(self):
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                self.client.get("/posts/")
+            return len(context)
+
+        for i in range(2):
+            Post.objects.create(title=f"글 {i}", content="내용", author=self.create_author(f"author{i}")[0])
+        few = count_queries()
+        for i in range(2, 6):
+            Post.objects.create(title=f"글 {i}", content="내용", author=self.create_author(f"author{i}")[0])
+        self.assertEqual(count_queries(), few)
+
+    def test_rendition_url_is_served(self):
+        author, rendition = self.create_author("author")
+        response = self.client.get(rendition.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertNotEqual(b"".join(response.streaming_content), PNG)
+        self.assertEqual(self.client.get(f"/attachments/{author.profile_image.pk}/webp/").status_code, 404)
+
+    def test_missing_rendition_falls_back_and_is_scheduled(self):
+        author = self.create_user("author", image=True)
+        post = Post.objects.create(title="글", content="내용", author=author)
+        with override_settings(BLOG_GENERATE_MISSING_RENDITIONS=True), \
+                mock.patch("blog.renditions.schedule_renditions") as schedule:
+            self.assertContains(self.client.get("/posts/"), author.profile_image.get_absolute_url())
+        schedule.assert_called()
+
+        # 변환본이 만들어지면 캐시된 목록·상세 페이지도 변환본 URL 로 바뀜
+        rendition = self.create_rendition(author.profile_image)
+        self.assertContains(self.client.get("/posts/"), rendition.get_absolute_url())
+        self.assertContains(self.client.get(f"/posts/{post.pk}"), rendition.get_absolute_url())
+
+
+class BlobStorageTests(BlogTestCase):
+    def test_replacing_file_releases_previous_blob(self):
+        user = self.create_user("owner")
+        attachment = user.add_attachment(ContentFile(b"first", name="a.txt"))
+        first = attachment.blob
+        shared = user.add_attachment(ContentFile(b"shared", name="b.txt"))
+
+        attachment.file = ContentFile(b"second", name="a.txt")
+        attachment.save()
+        self.assertNotEqual(attachment.blob, first)
+        self.assertFalse(Blob.objects.filter(pk=first.pk).exists())
+        self.assertTrue(FileDeletion.objects.filter(name=first.file.name).exists())
+
+        # 같은 내용으로 바꾸면 참조 수가 그대로 유지됨
+        shared.file = ContentFile(b"shared", name="b.txt")
+        shared.save()
+        self.assertEqual(Blob.objects.get(pk=shared.blob_id).ref_count, 1)
+
+
+class AttachmentFileTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        user = self.create_user("owner")
+        self.attachment = user.add_attachment(ContentFile(b"0123456789", name="a.txt"))
+        self.empty = user.add_attachment(ContentFile(b"", name="empty.txt"))
+        self.url = self.attachment.get_absolute_url()
+
+    def get(self, url=None, headers=None):
+        response = self.client.get(url or self.url, headers=headers)
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, content
+
+    def test_full_response(self):
+        response, content = self.get()
+        self.assertEqual((response.status_code, content), (200, b"0123456789"))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_single_and_suffix_ranges(self):
+        for header, expected, content_range in (
+            ("bytes=2-5", b"2345", "bytes 2-5/10"),
+            ("bytes=7-", b"789", "bytes 7-9/10"),
+            ("bytes=-3", b"789", "bytes 7-9/10"),
+            ("bytes=-20", b"0123456789", "bytes 0-9/10"),
+        ):
+            response, content = self.get(headers={"Range": header})
+            self.assertEqual((response.status_code, content), (206, expected), header)
+            self.assertEqual(response["Content-Range"], content_range)
+
+    def test_unsatisfiable_ranges(self):
+        for url, header, size in (
+            (self.url, "bytes=10-", 10),
+            (self.url, "bytes=-0", 10),
+            (self.empty.get_absolute_url(), "bytes=-5", 0),
+            (self.empty.get_absolute_url(), "bytes=0-", 0),
+        ):
+            response, _content = self.get(url, {"Range": header})
+            self.assertEqual(response.status_code, 416, header)
+            self.assertEqual(response["Content-Range"], f"bytes */{size}")
+            self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_multiple_ranges_fall_back_to_full_response(self):
+        response, content = self.get(headers={"Range": "bytes=0-1,4-5"})
+        self.assertEqual((response.status_code, content), (200, b"0123456789"))
+
+    def test_if_range(self):
+        etag = self.get()[0]["ETag"]
+        response, content = self.get(headers={"Range": "bytes=0-1", "If-Range": etag})
+        self.assertEqual((response.status_code, content), (206, b"01"))
+        response, content = self.get(headers={"Range": "bytes=0-1", "If-Range": '"other"'})
+        self.assertEqual((response.status_code, content), (200, b"0123456789"))
+
+    def test_if_none_match(self):
+        etag = self.get()[0]["ETag"]
+        response, content = self.get(headers={"If-None-Match": etag})
+        self.assertEqual((response.status_code, content), (304, b""))
+        self.assertEqual(response["ETag"], etag)
+
+
+class ApiTests(BlogTestCase):
+    def get_posts(self, query=""):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/api/posts/{query}")
+        self.assertEqual(response.status_code, 200)
+        post_query = next(query["sql"] for query in context if 'FROM "blog_post"' in query["sql"])
+        return response.json()["results"], post_query, len(context)
+
+    def test_sparse_fieldsets_defer_content(self):
+        self.create_posts(2)
+        results, sql, _count = self.get_posts()
+        self.assertNotIn("content", results[0])
+        self.assertNotIn('"blog_post"."content"', sql)
+
+        results, sql, _count = self.get_posts("?fields=id,content")
+        self.assertEqual(set(results[0]), {"id", "content"})
+        self.assertIn('"blog_post"."content"', sql)
+
+    def test_sparse_fieldsets_keep_query_count(self):
+        def create_posts(start, count):
+            for i in range(start, start + count):
+                category = Category.objects.create(name=f"c{i}", slug=f"c{i}")
+                Post.objects.create(title=f"글 {i}", content="내용", category=category)
+
+        create_posts(0, 2)
+        _results, _sql, few = self.get_posts("?fields=id,title,category_path")
+        create_posts(2, 6)
+        results, _sql, many = self.get_posts("?fields=id,title,category_path")
+        self.assertEqual(few, many)
+        self.assertEqual({result["category_path"] for result in results}, {f"c{i}" for i in range(8)})
+
+    def test_comments_of_deleted_posts_are_hidden(self):
+        post, deleted = self.create_posts(2)
+        visible = Comment.objects.create(post=post, content="댓글")
+        hidden = Comment.objects.create(post=deleted, content="삭제된 글의 댓글")
+        deleted.delete()
+
+        response = self.client.get("/api/comments/")
+        self.assertEqual([comment["id"] for comment in response.json()["results"]], [visible.pk])
+        self.assertEqual(self.client.get(f"/api/comments/{hidden.pk}/").status_code, 404)
+
+
+class SearchIndexTests(BlogTestCase):
+    def search_titles(self, query):
+        return sorted(post.title for post in search.search(query))
+
+    def test_short_query_escapes_wildcards(self):
+        Post.objects.create(title="100% 완료", content="내용")
+        Post.objects.create(title="a_b", content="내용")
+        Post.objects.create(title="다른 글", content="내용")
+        self.assertEqual(self.search_titles("%"), ["100% 완료"])
+        self.assertEqual(self.search_titles("_"), ["a_b"])
+
+    def test_rebuild_replaces_index(self):
+        post = Post.objects.create(title="검색 대상 글", content="트라이그램 본문")
+        Comment.objects.create(post=post, content="댓글 속 문장")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.SEARCH_TABLE}")
+        self.assertEqual(search.rebuild(batch_size=1), 2)
+        self.assertEqual(self.search_titles("트라이그램"), ["검색 대상 글"])
+        self.assertEqual(self.search_titles("댓글 속"), ["검색 대상 글"])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM sqlite_master WHERE name = %s", [search.SHADOW_TABLE])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_migration_backfills_index(self):
+        post = Post.objects.create(title="이전 글", content="마이그레이션 이전 본문")
+        Post.objects.create(title="삭제된 글", content="마이그레이션 이전 본문", is_active=False)
+        Comment.objects.create(post=post, content="예전 댓글 내용")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.SEARCH_TABLE}")
+        migration = importlib.import_module("blog.migrations.0011_backfill_search_index")
+        # SQLite 의 schema_editor 는 테스트 트랜잭션 안에서 열 수 없으므로 execute 만 흉내 냄
+        with connection.cursor() as cursor:
+            migration.backfill_search_index(None, SimpleNamespace(connection=connection, execute=cursor.execute))
+        self.assertEqual(self.search_titles("이전 본문"), ["이전 글"])
+        self.assertEqual(self.search_titles("예전 댓글"), ["이전 글"])
+
+
+class MarkdownSafetyTests(BlogTestCase):
+    def test_attribute_lists_are_not_rendered(self):
+        html = render_markdown('para\n{: onclick="alert(1)" }')["content_html"]
+        self.assertNotIn("<p onclick", html)
+
+    def test_encoded_javascript_links_are_removed(self):
+        for content in ["[x](JaVaScRiPt&#58;alert(1))", "[x](&#106;avascript:alert(1))", "![x](java&#x09;script:alert(1))"]:
+            with self.subTest(content=content):
+                self.assertNotIn("script", render_markdown(content)["content_html"].lower())
+        self.assertIn('href="https://example.com/?a=1&amp;b=2"',
+                      render_markdown("[x](https://example.com/?a=1&b=2)")["content_html"])
+
+    def test_served_page_has_no_injected_attributes(self):
+        post = Post.objects.create(title="글", content='para\n{: onclick="alert(1)" }\n\n[x](JaVaScRiPt&#58;alert(1))')
+        response = self.client.get(f"/posts/{post.pk}")
+        self.assertNotContains(response, "<p onclick")
+        self.assertNotContains(response, 'href="JaVaScRiPt')
+
+    def test_migration_rerenders_stale_content(self):
+        post = Post.objects.create(title="글", content="본문")
+        Post.all_objects.filter(pk=post.pk).update(content_html='<p onclick="alert(1)">본문</p>', render_version="old")
+        migration = importlib.import_module("blog.migrations.0014_rerender_unsafe_content")
+        migration.rerender_content(apps, SimpleNamespace(connection=connection))
+        post.refresh_from_db()
+        self.assertEqual(post.content_html, "<p>본문</p>")
+
+
+class RenderedContentTests(BlogTestCase):
+    def test_migration_backfills_rendered_content(self):
+        post = Post.objects.create(title="이전 글", content="# 제목\n\n**굵은** 본문")
+        Post.all_objects.filter(pk=post.pk).update(content_html="", excerpt="", toc="", reading_time=0, render_version="")
+        migration = importlib.import_module("blog.migrations.0012_backfill_rendered_content")
+        migration.backfill_rendered_content(apps, SimpleNamespace(connection=connection))
+
+        post.refresh_from_db()
+        self.assertIn("<strong>굵은</strong>", post.content_html)
+        self.assertNotEqual(post.render_version, "")
+        self.assertContains(self.client.get(f"/posts/{post.pk}"), "<strong>굵은</strong>", html=False)
+
+    def test_rerender_invalidates_pages(self):
+        post = Post.objects.create(title="글", content="이전 본문")
+        detail_etag = self.client.get(f"/posts/{post.pk}")["ETag"]
+        list_etag = self.client.get("/posts/")["ETag"]
+
+        # 시그널 없이 본문만 바뀐 상태에서 렌더러 버전을 올림
+        Post.all_objects.filter(pk=post.pk).update(content="새 본문")
+        with mock.patch("blog.management.commands.rerender_posts.get_renderer_version", return_value="next"):
+            call_command("rerender_posts", workers=1, stdout=StringIO())
+
+        response = self.client.get(f"/posts/{post.pk}", headers={"If-None-Match": detail_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "새 본문")
+        response = self.client.get("/posts/", headers={"If-None-Match": list_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "새 본문")
+
+
+class InlineExecutor:
+    # 워커 프로세스는 테스트 DB 를 볼 수 없으므로 같은 프로세스에서 실행
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, fn, *iterables, chunksize=1):
+        return map(fn, *iterables)
+
+
+@mock.patch("blog.management.commands.export_static.ProcessPoolExecutor", InlineExecutor)
+class ExportStaticTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.output, ignore_errors=True)
+
+    def export(self):
+        call_command("export_static", str(self.output), stdout=StringIO(), stderr=StringIO())
+        return json.loads((self.output / "manifest.json").read_text())
+
+    def test_restored_post_is_exported_again(self):
+        post = self.create_posts(1)[0]
+        self.export()
+        detail = self.output / f"posts/{post.pk}/index.html"
+        self.assertTrue(detail.exists())
+
+        post.delete()
+        self.export()
+        self.assertFalse(detail.exists())
+
+        Post.all_objects.filter(pk=post.pk).restore()
+        self.export()
+        self.assertTrue(detail.exists())
+
+    def test_failed_render_keeps_watermark(self):
+        post = self.create_posts(1)[0]
+        exported_at = self.export()["exported_at"]
+
+        post.title = "수정한 글"
+        post.save()
+        with mock.patch("blog.management.commands.export_static.render_page", return_value=("page", "오류")):
+            self.assertEqual(self.export()["exported_at"], exported_at)
+        self.assertNotEqual(self.export()["exported_at"], exported_at)
+        self.assertIn("수정한 글", (self.output / f"posts/{post.pk}/index.html").read_text())
+
+
+    def test_cursor_list_is_exported_with_page_links(self):
+        self.create_posts(10, Post.PostType.GUESTBOOK)
+        self.export()
+        for path in ("guestbooks/index.html", "guestbooks/partial/index.html"):
+            html = (self.output / path).read_text()
+            self.assertIn("?page=2", html)
+            self.assertNotIn("cursor=", html)
+        self.assertTrue((self.output / "guestbooks/page/2/index.html").exists())
+
+    def test_renamed_category_rerenders_descendant_posts(self):
+        parent = Category.objects.create(name="상위", slug="parent")
+        child = Category.objects.create(name="하위", slug="child", parent=parent)
+        Post.objects.create(title="글", content="내용", category=child)
+        self.export()
+        listing = self.output / "posts/index.html"
+        self.assertIn("상위 &gt; 하위", listing.read_text())
+
+        parent.name = "바뀐 상위"
+        parent.save()
+        self.export()
+        self.assertIn("바뀐 상위 &gt; 하위", listing.read_text())
+
+
+class AsyncViewTests(BlogTestCase):
+    async def test_async_views_answer_conditional_requests(self):
+        post = await Post.objects.acreate(title="비동기 글", content="내용")
+        client = AsyncClient()
+        with override_settings(ROOT_URLCONF=urlconf("async_urls", ASYNC_ROUTE_NAMES)):
+            for path in ("/posts/", f"/posts/{post.pk}"):
+                response = await client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, "비동기 글")
+                response = await client.get(path, headers={"If-None-Match": response["ETag"]})
+                self.assertEqual(response.status_code, 304)
+
+
+class QueryInstrumentationTests(BlogTestCase):
+    SERVER_TIMING_RE = re.compile(r'^db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=([\d.]+), total;dur=[\d.]+$')
+
+    @override_settings(BLOG_QUERY_SAMPLE_RATE=1.0)
+    def test_server_timing_header(self):
+        self.create_posts(3)
+        # 템플릿 렌더링 훅은 측정 중인 요청이 있을 때만 설치됨
+        render = Template._render
+        self.assertNotEqual(render.__module__, "blog.middleware")
+        response = self.client.get("/posts/")
+        match = self.SERVER_TIMING_RE.match(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        self.assertGreater(int(match[1]), 0)
+        self.assertGreater(float(match[2]), 0)
+        self.assertIs(Template._render, render)
+
+    def test_sample_rate_gates_instrumentation(self):
+        with override_settings(BLOG_QUERY_SAMPLE_RATE=0.0):
+            self.assertNotIn("Server-Timing", self.client_class().get("/posts/"))
+        with override_settings(BLOG_QUERY_SAMPLE_RATE=0.5), mock.patch("blog.middleware.random.random") as sample:
+            sample.return_value = 0.9
+            self.assertNotIn("Server-Timing", self.client_class().get("/posts/"))
+            sample.return_value = 0.1
+            self.assertIn("Server-Timing", self.client_class().get("/posts/"))
+
+    def test_fingerprint_groups_queries_by_shape(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM post WHERE id IN (%s, %s, %s) AND title = 'it''s' AND views > 10"),
+            "SELECT * FROM post WHERE id IN (...) AND title = ? AND views > ?",
+        )
+        self.assertEqual(fingerprint("SELECT 1 WHERE id IN (%s, %s)"), fingerprint("SELECT 2 WHERE id IN (%s, %s, %s)"))
+
+        recorder = RequestRecorder()
+        for pk in range(3):
+            recorder.record(f"SELECT * FROM post WHERE id = {pk}", 0.001)
+        recorder.record("SELECT COUNT(*) FROM post", 0.001)
+        [duplicate] = recorder.duplicates(3)
+        self.assertEqual(duplicate["sql"], "SELECT * FROM post WHERE id = ?")
+        self.assertEqual(duplicate["count"], 3)
+        self.assertIn("blog/tests.py", duplicate["callsite"])
+
+    @override_settings(BLOG_QUERY_SAMPLE_RATE=1.0, BLOG_DUPLICATE_QUERY_THRESHOLD=3)
+    def test_repeated_queries_are_logged(self):
+        posts = self.create_posts(3)
+
+        def view(request):
+            for post in posts:
+                Post.objects.get(pk=post.pk)
+            return HttpResponse()
+
+        with self.assertLogs("blog.performance", "WARNING") as logs:
+            response = QueryInstrumentationMiddleware(view)(RequestFactory().get("/posts/"))
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+        self.assertIn("반복 쿼리 감지 GET /posts/: 3회 blog/tests.py", logs.output[0])
+
+
+# 명령이 여러 스레드에서 요청하므로 데이터가 커밋되어 있어야 함
+@override_settings(ALLOWED_HOSTS=["bench.local"])
+class CompareThroughputTests(BlogTestMixin, TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def compare(self, *paths):
+        call_command("compare_throughput", *paths, requests=4, concurrency=2, host="bench.local", stdout=StringIO())
+
+    def test_compares_sync_and_async_views(self):
+        post = Post.objects.create(title="글", content="내용")
+        self.compare("/posts/", f"/posts/{post.pk}")
+
+    def test_error_responses_fail(self):
+        with self.assertRaisesMessage(CommandError, "404 x4"):
+            self.compare("/posts/999")
+
+
+# 읽기 쿼리가 replica 로 가는 실제 라우팅 그대로 측정
+class QueryBudgetTests(BlogTestMixin, TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        super().setUp()
+        call_command("seed_blog", users=5, category_depth=2, category_fanout=2, posts=10, comments=2,
+                     stdout=StringIO())
+
+    def test_views_within_query_budgets(self):
+        # 예산을 넘거나 오류로 응답하는 URL 이 있으면 CommandError
+        call_command("benchmark_views", iterations=2, host="testserver", stdout=StringIO())
+
+    def test_error_responses_fail(self):
+        with self.assertRaisesMessage(CommandError, "HTTP 400"):
+            call_command("benchmark_views", iterations=1, host="invalid.example", stdout=StringIO())
+
+
+class QueryPlanTests(BlogTestMixin, TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def test_queries_use_indexes(self):
+        call_command("seed_blog", users=5, category_depth=2, category_fanout=2, posts=10, comments=2,
+                     stdout=StringIO())
+        # manage.py 로 실행할 때처럼 시스템 검사도 함께 실행
+        call_command("check_query_plans", host="testserver", skip_checks=False, stdout=StringIO())
+
+
+# 백그라운드 반영 스레드가 테스트 중에 끼어들지 않도록 간격을 늘림
+@override_settings(BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600)
+class CommentCountTests(BlogTestCase):
+    def assertCounts(self, *expected):
+        self.assertEqual([post.comments_count for post in Post.all_objects.order_by("pk")], list(expected))
+
+    def test_counter_follows_create_delete_and_move(self):
+        first, second = self.create_posts(2)
+        comments = [Comment.objects.create(post=first, content=f"댓글 {i}") for i in range(3)]
+        self.assertCounts(3, 0)
+
+        comments[0].delete()
+        self.assertCounts(2, 0)
+        Comment.all_objects.filter(pk=comments[0].pk).restore()
+        self.assertCounts(3, 0)
+        comments[1].hard_delete()
+        self.assertCounts(2, 0)
+
+        # 다른 게시물로 옮기면 두 게시물의 수가 함께 바뀌고 두 목록 페이지 모두 갱신됨
+        guestbook = self.create_posts(1, Post.PostType.GUESTBOOK)[0]
+        etag = self.client.get("/posts/")["ETag"]
+        comments[2].post = guestbook
+        comments[2].save()
+        self.assertCounts(1, 0, 1)
+        self.assertEqual(self.client.get("/posts/", headers={"If-None-Match": etag}).status_code, 200)
+        comments[2].content = "수정한 댓글"
+        comments[2].save()
+        self.assertCounts(1, 0, 1)
+
+    def test_recount_repairs_drift_and_invalidates_pages(self):
+        post, other = self.create_posts(2)
+        Comment.objects.create(post=post, content="댓글")
+        etag = self.client.get("/posts/")["ETag"]
+
+        # 같은 값이면 갱신하지 않고 페이지도 무효화하지 않음
+        stdout = StringIO()
+        call_command("recount_comments", stdout=stdout)
+        self.assertIn("0개", stdout.getvalue())
+        self.assertEqual(self.client.get("/posts/", headers={"If-None-Match": etag}).status_code, 304)
+
+        Post.all_objects.filter(pk=post.pk).update(comments_count=5)
+        Post.all_objects.filter(pk=other.pk).update(comments_count=2)
+        etag = self.client.get("/posts/")["ETag"]
+        stdout = StringIO()
+        call_command("recount_comments", batch_size=1, stdout=stdout)
+        self.assertIn("2개", stdout.getvalue())
+        self.assertCounts(1, 0)
+        self.assertEqual(self.client.get("/posts/", headers={"If-None-Match": etag}).status_code, 200)
+
+
+# 라우터가 고르는 연결을 보려면 테스트가 트랜잭션 밖에서 실행되어야 함
+class DatabaseRoutingTests(BlogTestMixin, TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def test_reads_use_replica_outside_write_transactions(self):
+        post = Post.objects.create(title="글", content="내용")
+        self.assertEqual(post._state.db, "default")
+        self.assertEqual(Post.objects.all().db, "replica")
+        self.assertEqual(Post.objects.get(pk=post.pk)._state.db, "replica")
+        with transaction.atomic():
+            self.assertEqual(Post.objects.all().db, "default")
+        self.assertEqual(Post.objects.all().db, "replica")
+
+    def test_backend_pragmas_apply_to_both_aliases(self):
+        for alias in ("default", "replica"):
+            with connections[alias].cursor() as cursor:
+                self.assertEqual(cursor.execute("PRAGMA cache_size").fetchone()[0], -64 * 1024, alias)
+                self.assertEqual(cursor.execute("PRAGMA busy_timeout").fetchone()[0], 5000, alias)
+
+
+class BusyRetryTests(SimpleTestCase):
+    def setUp(self):
+        path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        # 다른 연결이 쓰기 잠금을 쥐고 있어 busy_timeout 없이 바로 "database is locked" 가 나는 상태
+        self.holder = self.connect(path / "db.sqlite3")
+        self.holder.execute("CREATE TABLE item (value INTEGER)")
+        self.holder.execute("BEGIN IMMEDIATE")
+        self.writer = self.connect(path / "db.sqlite3")
+
+    def connect(self, path):
+        conn = Database.connect(path, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 0")
+        self.addCleanup(conn.close)
+        return conn
+
+    def insert(self):
+        self.writer.cursor(factory=RetryingCursorWrapper).execute("INSERT INTO item VALUES (%s)", [1])
+
+    def test_autocommit_write_is_retried_after_lock_is_released(self):
+        with mock.patch("j3onghoon.sqlite3.base.time.sleep", side_effect=lambda delay: self.holder.execute("COMMIT")) as sleep:
+            self.insert()
+        sleep.assert_called_once()
+        self.assertEqual(self.writer.execute("SELECT value FROM item").fetchall(), [(1,)])
+
+    def test_gives_up_after_retries(self):
+        with mock.patch("j3onghoon.sqlite3.base.time.sleep") as sleep, self.assertRaises(Database.OperationalError):
+            self.insert()
+        self.assertEqual(sleep.call_count, BUSY_RETRIES)
+
+    def test_writes_inside_transaction_are_not_retried(self):
+        self.writer.execute("BEGIN")
+        with mock.patch("j3onghoon.sqlite3.base.time.sleep") as sleep, self.assertRaises(Database.OperationalError):
+            self.insert()
+        sleep.assert_not_called()
+
+
+class PurgeDeletedTests(BlogTestCase):
+    def expire(self, *categories, days=60):
+        Category.all_objects.filter(pk__in=[category.pk for category in categories])\
+            .update(is_active=False, deleted=timezone.now() - timedelta(days=days))
+
+    def test_keeps_deleted_categories_with_remaining_descendants(self):
+        parent = Category.objects.create(name="상위", slug="parent")
+        child = Category.objects.create(name="하위", slug="child", parent=parent)
+        grandchild = Category.objects.create(name="손자", slug="grandchild", parent=child)
+        post = Post.objects.create(title="글", content="내용", category=grandchild)
+        leaf = Category.objects.create(name="잎", slug="leaf")
+        self.expire(parent, leaf)
+
+        call_command("purge_deleted", pause=0, stdout=StringIO())
+        self.assertEqual(set(Category.all_objects.values_list("pk", flat=True)), {parent.pk, child.pk, grandchild.pk})
+        post.refresh_from_db()
+        self.assertEqual(post.category, grandchild)
+
+        # 하위 카테고리가 아직 보존 기간 안이면 계속 남겨 둠
+        self.expire(child)
+        self.expire(grandchild, days=1)
+        call_command("purge_deleted", pause=0, stdout=StringIO())
+        self.assertEqual(Category.all_objects.count(), 3)
+
+        self.expire(grandchild)
+        call_command("purge_deleted", pause=0, stdout=StringIO())
+        self.assertFalse(Category.all_objects.exists())
+
+
+class ViewCountBufferTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.buffer = ViewCountBuffer(Post)
+        self.posts = self.create_posts(2)
+
+    def views(self):
+        return list(Post.objects.order_by("pk").values_list("views", flat=True))
+
+    def test_increments_are_buffered_until_flush(self):
+        for _ in range(3):
+            self.buffer.increment(self.posts[0].pk)
+        self.assertEqual(self.views(), [0, 0])
+        self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(self.views(), [3, 0])
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_same_viewer_is_counted_once(self):
+        pk = self.posts[0].pk
+        self.assertTrue(self.buffer.increment(pk, viewer="a"))
+        self.assertFalse(self.buffer.increment(pk, viewer="a"))
+        self.assertTrue(self.buffer.increment(pk, viewer="b"))
+        self.assertTrue(self.buffer.increment(self.posts[1].pk, viewer="a"))
+        self.buffer.flush()
+        self.assertEqual(self.views(), [2, 1])
+
+    def test_partial_failure_requeues_only_unapplied_groups(self):
+        first, second = self.posts
+        self.buffer.increment(first.pk)
+        self.buffer.increment(first.pk)
+        self.buffer.increment(second.pk)
+
+        # 증가분이 다른 두 묶음 중 두 번째 UPDATE 만 실패
+        filter_ = Post.all_objects.filter
+        calls = []
+
+        def failing_filter(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise DatabaseError("database is locked")
+            return filter_(*args, **kwargs)
+
+        with mock.patch.object(Post.all_objects, "filter", failing_filter), self.assertLogs("blog.counters", "ERROR"):
+            self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.views(), [2, 0])
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.views(), [2, 1])
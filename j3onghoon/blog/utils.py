@@ -1,3 +1,9 @@
+import hashlib
+
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
 def set_image(instance, image_field, file, **kwargs):
     from .models import FileType
     image = getattr(instance, image_field)
@@ -5,3 +11,14 @@ def set_image(instance, image_field, file, **kwargs):
         image.delete()
 
     return instance.add_attachment(file, file_type=FileType.IMAGE, **kwargs)
+
+
+def hash_file(file, chunk_size=HASH_CHUNK_SIZE):
+    # 파일 전체를 메모리에 올리지 않고 청크 단위로 SHA-256 과 크기를 계산
+    digest = hashlib.sha256()
+    size = 0
+    file.seek(0)
+    for chunk in file.chunks(chunk_size):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
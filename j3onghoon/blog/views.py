@@ -1,27 +1,162 @@
+import hashlib
+from datetime import datetime
+
+from django.shortcuts import get_object_or_404
 from django.views.generic import ListView, DetailView, TemplateView
-from django.db.models import Count
+from django.db.models import Count, Max, Q
+from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+from django.utils.functional import cached_property
+from django.utils.http import http_date
+from django.utils.translation import gettext as _
 
+from .archives import archive_months, category_bucket, category_post_counts
+from .cache import cached_page_response, get_generation
+from .comments import load_comment_tree
+from .counters import ViewCountBuffer
+from .fragments import PROFILE_IMAGE_GENERATION, render_comment_bodies, render_post_rows, walk_comments
 from .models import User, Post, Comment, Attachment, Category
+from .pagination import CachedCountPaginator, CursorPaginator, InvalidCursor
+from .projections import list_projection, post_rows
+from .search import search
 
 
 class HomeView(TemplateView):
     template_name = "home.html"
 
 
-class PostBaseListView(ListView):
+class ConditionalGetMixin:
+    # 본문을 만들기 전에 가벼운 집계 쿼리로 검증자를 계산해 변경이 없으면 304 로 응답
+    # 전체 페이지와 HTMX 부분 템플릿은 서로 다른 ETag 를 가짐
+    def get_validator_parts(self):
+        raise NotImplementedError
+
+    async def aget_validator_parts(self):
+        # 비동기 뷰에서 사용. get_validator_parts 와 같은 값을 비동기 API 로 계산
+        raise NotImplementedError
+
+    def get_template_variant(self):
+        return "partial" if "HX-Request" in self.request.headers else "full"
+
+    def get_validators(self):
+        return self.make_validators(self.get_validator_parts())
+
+    async def aget_validators(self):
+        return self.make_validators(await self.aget_validator_parts())
+
+    def make_validators(self, parts):
+        if parts is None:
+            return None, None
+        *parts, last_modified = parts
+        parts += [self.get_template_variant(), self.request.GET.urlencode()]
+        digest = hashlib.md5("|".join(map(str, parts)).encode(), usedforsecurity=False).hexdigest()
+        return quote_etag(digest), last_modified and last_modified.timestamp()
+
+    def conditional_get(self, request, build_response):
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = build_response()
+        return self.add_validators(response, etag, last_modified)
+
+    async def aconditional_get(self, request, build_response):
+        # build_response 는 코루틴 함수
+        etag, last_modified = await self.aget_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await build_response()
+        return self.add_validators(response, etag, last_modified)
+
+    def add_validators(self, response, etag, last_modified):
+        if etag and response.status_code in (200, 304) and not getattr(response, "is_stale_page", False):
+            response.headers.setdefault("ETag", etag)
+            if last_modified:
+                response.headers.setdefault("Last-Modified", http_date(last_modified))
+        patch_vary_headers(response, ["HX-Request"])
+        return response
+
+
+class PostBaseListView(ConditionalGetMixin, ListView):
     model = Post
     paginate_by = 8
+    paginator_class = CachedCountPaginator
+    # "page": 페이지 번호 기반, "cursor": (created, id) 키셋 기반
+    pagination_mode = "page"
+    # 커서 모드에서 캐시된 개수로 근사 페이지 범위를 제공할지 여부
+    approximate_page_range = False
+    # "rows": 필요한 열만 읽어 PostRow 로 반환, "only": 필요한 열만 읽은 모델 인스턴스, None: 전체 열
+    list_projection = "rows"
 
-    # todo 캐시 추가
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+        return self.conditional_get(request, lambda: cached_page_response(
+            self.post_type,
+            self.get_template_variant(),
+            self.get_cache_query(),
+            lambda: super(PostBaseListView, self).get(request, *args, **kwargs),
+        ))
+
+    def get_scope(self):
+        # 같은 유형 안에서 목록 범위를 구분하는 값 (카테고리, 기간 등). 페이지 캐시와 개수 캐시 키에 포함
+        return ""
+
+    def get_cache_query(self):
+        query = self.request.GET.urlencode()
+        return f"{scope}?{query}" if (scope := self.get_scope()) else query
+
+    def get_cached_count(self):
+        # 범위별 개수를 따로 관리하는 목록은 COUNT 쿼리 대신 이 값을 사용
+        return None
+
+    def get_validator_parts(self):
+        # 댓글 변경은 Post.updated 에 반영되지 않으므로 페이지 캐시 세대 번호를 함께 사용
+        aggregate = self.model.objects.filter(type=self.post_type).aggregate(count=Count("pk"), updated=Max("updated"))
+        return self.post_type, get_generation(self.post_type), aggregate["count"], aggregate["updated"]
 
     def get_queryset(self):
-        return self.model.objects.filter(type=self.post_type)\
-            .annotate(comments_count=Count("comments"))
+        queryset = self.model.objects.filter(type=self.post_type).order_by("-created", "-pk")
+        if self.list_projection == "rows":
+            return post_rows(queryset)
+        if self.list_projection == "only":
+            return list_projection(queryset)
+        return queryset.select_related("category", "author")
+
+    def get_count_cache_key(self):
+        return f"blog:{self.post_type}:count:{self.get_scope()}:{get_generation(self.post_type)}"
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        paginator = self.paginator_class(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_cache_key=self.get_count_cache_key() if self.pagination_mode == "cursor" else None,
+            **kwargs,
+        )
+        if (count := self.get_cached_count()) is not None:
+            paginator.__dict__["count"] = count
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.pagination_mode != "cursor" or self.request.GET.get(self.page_kwarg):
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, count_cache_key=self.get_count_cache_key())
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidCursor as e:
+            raise Http404(_("잘못된 페이지입니다: %(message)s") % {"message": str(e)})
+        return paginator, page, page.object_list, page.has_other_pages()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        render_post_rows(context["object_list"])
+        User.prefetch_attachments((post.author for post in context["object_list"]), renditions=True)
+        context["cursor_pagination"] = isinstance(context["paginator"], CursorPaginator)
+        if context["cursor_pagination"] and not self.approximate_page_range:
+            context["elided_page_range"] = []
+            return context
+
         context["elided_page_range"] = context["paginator"].get_elided_page_range(
             number=context["page_obj"].number,
             on_each_side=2,
@@ -30,7 +165,7 @@ class PostBaseListView(ListView):
         return context
 
     def get_template_names(self):
-        if "HX-Request" in self.request.headers:
+        if self.get_template_variant() == "partial":
             return [f"{self.post_type}_list_partial.html"]
         return [f"{self.post_type}_list.html"]
 
@@ -42,17 +177,137 @@ class PostListView(PostBaseListView):
     post_type = "post"
 
 
-class PostDetailView(DetailView):
+post_view_counts = ViewCountBuffer(Post)
+
+
+class PostDetailView(ConditionalGetMixin, DetailView):
     model = Post
     template_name = "post_detail.html"
+    count_views = True
+
+    def get(self, request, *args, **kwargs):
+        response = self.conditional_get(request, lambda: super(PostDetailView, self).get(request, *args, **kwargs))
+        if self.count_views:
+            post_view_counts.increment(self.kwargs["pk"], viewer=self.get_viewer())
+        return response
+
+    def get_validator_parts(self):
+        return self.make_validator_parts(self.get_validator_queryset().first(), get_generation(PROFILE_IMAGE_GENERATION))
+
+    def get_validator_queryset(self):
+        # 소프트 삭제는 updated 를 갱신하지 않으므로 활성 댓글 수도 검증자에 포함
+        # 다시 렌더링해도 updated 는 그대로이므로 렌더러 버전도 포함
+        active = Q(comments__is_active=True)
+        return self.model.objects.filter(pk=self.kwargs["pk"]).values("updated", "render_version").annotate(
+            comments_updated=Max("comments__updated", filter=active),
+            comments_count=Count("comments", filter=active),
+        ).order_by("pk")
+
+    @staticmethod
+    def make_validator_parts(validator, profile_image_generation):
+        if validator is None:
+            return None
+        return (validator["updated"], validator["render_version"], validator["comments_updated"],
+                validator["comments_count"], profile_image_generation,
+                max(filter(None, [validator["updated"], validator["comments_updated"]])))
+
+    def get_viewer(self):
+        session = getattr(self.request, "session", None)
+        return session and session.session_key or self.request.META.get("REMOTE_ADDR")
 
     def get_queryset(self):
-        return self.model.objects.prefetch_related("comments", "comments__author")
+        return self.model.objects.select_related("author", "category")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["comment_page"] = load_comment_tree(self.object, page=self.request.GET.get("comment_page"))
+        context["comments"] = render_comment_bodies(context["comment_page"].object_list)
+        authors = [self.object.author, *(comment.author for comment in walk_comments(context["comments"]))]
+        User.prefetch_attachments(authors, renditions=True)
+        return context
 
 
 class GuestBookListView(PostBaseListView):
     post_type = "guestbook"
+    pagination_mode = "cursor"
 
 
 class PortfolioListView(PostBaseListView):
     post_type = "portfolio"
+
+
+class CategoryPostListView(PostBaseListView):
+    post_type = "post"
+
+    def get_scope(self):
+        return f"category:{self.kwargs['slug']}"
+
+    @cached_property
+    def category(self):
+        return get_object_or_404(Category, slug=self.kwargs["slug"])
+
+    def get_queryset(self):
+        return super().get_queryset().filter(self.category.subtree_filter("category__"))
+
+    def get_cached_count(self):
+        return category_post_counts.get(category_bucket(self.post_type, self.category.pk))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        Category.fill_paths([self.category])
+        context["category"] = self.category
+        context["category_post_count"] = context["paginator"].count
+        return context
+
+
+class ArchivePostListView(PostBaseListView):
+    post_type = "post"
+
+    def get_scope(self):
+        return f"archive:{self.kwargs['year']}-{self.kwargs.get('month', '')}"
+
+    def get_period(self):
+        year, month = self.kwargs["year"], self.kwargs.get("month")
+        try:
+            if month:
+                start = datetime(year, month, 1)
+                end = datetime(year + month // 12, month % 12 + 1, 1)
+            else:
+                start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        except ValueError:
+            raise Http404(_("잘못된 기간입니다."))
+        return timezone.make_aware(start), timezone.make_aware(end)
+
+    def get_queryset(self):
+        start, end = self.get_period()
+        return super().get_queryset().filter(created__gte=start, created__lt=end)
+
+    def get_cached_count(self):
+        months = archive_months(self.post_type)
+        month = self.kwargs.get("month")
+        return sum(count for year, m, count in months if year == self.kwargs["year"] and (not month or m == month))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["archive_year"] = self.kwargs["year"]
+        context["archive_month"] = self.kwargs.get("month")
+        context["archive_months"] = archive_months(self.post_type)
+        return context
+
+
+class SearchView(PostBaseListView):
+    post_type = "post"
+
+    def get(self, request, *args, **kwargs):
+        return super(PostBaseListView, self).get(request, *args, **kwargs)
+
+    def get_search_query(self):
+        return self.request.GET.get("q", "")
+
+    def get_queryset(self):
+        return search(self.get_search_query(), post_type=self.request.GET.get("type"))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["search_query"] = self.get_search_query()
+        return context
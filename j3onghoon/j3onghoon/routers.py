@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import connections
+
+
+class ReadWriteRouter:
+    # 읽기는 읽기 전용 연결("replica")로, 쓰기는 단일 쓰기 연결("default")로 보냄
+    # 쓰기 트랜잭션 중의 읽기는 커밋 전 변경을 볼 수 있도록 쓰기 연결을 사용
+    read_alias = "replica"
+    write_alias = "default"
+
+    def db_for_read(self, model, **hints):
+        if self.read_alias not in settings.DATABASES or connections[self.write_alias].in_atomic_block:
+            return self.write_alias
+        return self.read_alias
+
+    def db_for_write(self, model, **hints):
+        return self.write_alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == self.write_alias
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.QueryInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -78,13 +81,57 @@ WSGI_APPLICATION = 'j3onghoon.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# WAL, busy_timeout 등 연결마다 적용할 PRAGMA 기본값은 j3onghoon.sqlite3 백엔드의 DEFAULT_PRAGMAS 에 있으며
+# 바꿀 값만 OPTIONS 의 "pragmas" 로 지정
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'j3onghoon.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    'replica': {
+        'ENGINE': 'j3onghoon.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'read_only': True,
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
 }
 
+DATABASE_ROUTERS = ['j3onghoon.routers.ReadWriteRouter']
+
+
+# 페이지 캐시의 세대 번호, 재생성 락, 무효화가 모든 워커에 적용되도록 반드시 프로세스 간에 공유되는 캐시를 사용
+# (LocMemCache 는 프로세스마다 따로라 사용 불가). 여러 서버로 배포하면 REDIS_URL 을 지정해 Redis 사용,
+# 지정하지 않으면 같은 서버의 워커끼리 공유되는 파일 캐시 사용 (add/incr 가 원자적이지 않으므로 운영에서는 Redis 권장)
+# DB 캐시는 캐시 조회마다 SQLite 쿼리와 쓰기 잠금이 생겨 사용하지 않음
+if REDIS_URL := os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('BLOG_CACHE_DIR', Path(tempfile.gettempdir()) / 'j3onghoon-cache'),
+            'OPTIONS': {
+                'MAX_ENTRIES': 100000,
+            },
+        },
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,3 +184,50 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ),
 }
+
+# 조회수 버퍼를 DB 에 반영하는 주기(초). 프로세스가 비정상 종료되면 최대 이 시간만큼의 조회수가 유실됨
+BLOG_VIEW_COUNT_FLUSH_INTERVAL = 10
+# 같은 세션의 반복 조회를 무시하는 시간(초)
+BLOG_VIEW_COUNT_DEDUPE_TIMEOUT = 60 * 30
+
+# 이미지 변환본(썸네일, WebP)을 생성하는 프로세스 수와 업로드 직후 생성 여부
+BLOG_RENDITION_WORKERS = 2
+BLOG_EAGER_RENDITIONS = True
+# 페이지를 그릴 때 없는 변환본을 발견하면 생성을 예약할지 여부
+BLOG_GENERATE_MISSING_RENDITIONS = True
+
+# 첨부 파일 전송을 웹 서버에 넘길 방식: None(직접 전송), "x-sendfile"(Apache 등), "x-accel-redirect"(nginx)
+BLOG_ATTACHMENT_SENDFILE = None
+# X-Accel-Redirect 사용 시 nginx 의 internal location 경로 (MEDIA_ROOT 를 가리키도록 설정)
+BLOG_ATTACHMENT_ACCEL_PREFIX = "/protected/"
+
+# ASGI 로 배포할 때 비동기 뷰를 사용할 URL 이름 (예: {"posts", "post-detail"})
+BLOG_ASYNC_ROUTES = set()
+
+# benchmark_views 명령이 강제하는 URL 이름별 최대 쿼리 수 (캐시를 비운 상태 기준)
+BLOG_QUERY_BUDGETS = {
+    "home": 2,
+    "posts": 7,
+    "post-detail": 5,
+    "guestbooks": 6,
+    "portfolios": 7,
+    "category-posts": 10,
+    "archive-year": 7,
+    "archive-month": 7,
+    "search": 4,
+    "feed-atom": 1,
+    "feed-rss": 1,
+    "sitemap-segment": 1,
+    "attachment-file": 1,
+    "api:post-list": 4,
+    "api:post-detail": 2,
+    "api:comment-list": 3,
+    "api:comment-detail": 2,
+    "api:category-list": 4,
+    "api:category-detail": 3,
+}
+
+# 요청별 쿼리 계측 (Server-Timing 헤더, 느린 요청/반복 쿼리 로그) 을 적용할 요청 비율
+BLOG_QUERY_SAMPLE_RATE = 1.0 if DEBUG else 0.05
+BLOG_SLOW_REQUEST_MS = 500
+BLOG_DUPLICATE_QUERY_THRESHOLD = 3
@@ -0,0 +1,65 @@
+import time
+from pathlib import Path
+
+from django.db.backends.sqlite3 import base
+from django.db.backends.sqlite3.base import Database
+
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+}
+BUSY_RETRIES = 5
+BUSY_RETRY_DELAY = 0.05
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "BEGIN")
+
+
+def is_busy(error):
+    message = str(error)
+    return "database is locked" in message or "database is busy" in message
+
+
+class RetryingCursorWrapper(base.SQLiteCursorWrapper):
+    # busy_timeout 이 지나도 잠금을 얻지 못한 자동 커밋 쓰기는 지수 백오프로 다시 시도
+    # 트랜잭션 안의 문장은 다시 시도해도 잠금 순서가 바뀌지 않으므로 그대로 예외를 전달
+    def execute(self, query, params=None):
+        return self._retry(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        return self._retry(super().executemany, query, param_list)
+
+    def _retry(self, execute, query, params):
+        retryable = query.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                return execute(query, params)
+            except Database.OperationalError as e:
+                if not retryable or attempt == BUSY_RETRIES or not is_busy(e) or self.connection.in_transaction:
+                    raise
+                time.sleep(BUSY_RETRY_DELAY * 2 ** attempt)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # OPTIONS 의 "pragmas" 는 새 연결마다 적용하고, "read_only" 이면 mode=ro URI 로 연결
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **kwargs.pop("pragmas", {})}
+        self.read_only = kwargs.pop("read_only", False)
+        if self.read_only and not self.is_in_memory_db():
+            kwargs["database"] = f"{Path(kwargs['database']).resolve().as_uri()}?mode=ro"
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            if self.read_only and name == "journal_mode":
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor(factory=RetryingCursorWrapper)
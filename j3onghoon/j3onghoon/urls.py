@@ -14,17 +14,45 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from blog import views
-
-
-urlpatterns = [
-    path("admin/", admin.site.urls),
-    path("accounts/", include("django.contrib.auth.urls")),
-    path("", views.HomeView.as_view(), name="home"),
-    path("posts/", views.PostListView.as_view(), name="posts"),
-    path("posts/<int:pk>", views.PostDetailView.as_view(), name="post-detail"),
-    path("guestbooks/", views.GuestBookListView.as_view(), name="guestbooks"),
-    path("portfolios/", views.PortfolioListView.as_view(), name="portfolios"),
-]
+from blog import async_views, feeds, media, views
+from blog.api import router
+
+
+# 동기/비동기 뷰를 바꿔 쓸 수 있는 경로
+ASYNC_ROUTE_NAMES = {"posts", "post-detail", "guestbooks", "portfolios"}
+
+
+def build_urlpatterns(async_routes):
+    # async_routes 에 포함된 경로만 비동기 뷰 사용
+    def route_view(name, sync_view, async_view):
+        return (async_view if name in async_routes else sync_view).as_view()
+
+    return [
+        path("admin/", admin.site.urls),
+        path("accounts/", include("django.contrib.auth.urls")),
+        path("", views.HomeView.as_view(), name="home"),
+        path("posts/", route_view("posts", views.PostListView, async_views.AsyncPostListView), name="posts"),
+        path("posts/<int:pk>", route_view("post-detail", views.PostDetailView, async_views.AsyncPostDetailView),
+             name="post-detail"),
+        path("guestbooks/", route_view("guestbooks", views.GuestBookListView, async_views.AsyncGuestBookListView),
+             name="guestbooks"),
+        path("portfolios/", route_view("portfolios", views.PortfolioListView, async_views.AsyncPortfolioListView),
+             name="portfolios"),
+        path("categories/<slug:slug>/", views.CategoryPostListView.as_view(), name="category-posts"),
+        path("archive/<int:year>/", views.ArchivePostListView.as_view(), name="archive-year"),
+        path("archive/<int:year>/<int:month>/", views.ArchivePostListView.as_view(), name="archive-month"),
+        path("search/", views.SearchView.as_view(), name="search"),
+        path("feeds/<str:post_type>/atom.xml", feeds.PostFeedView.as_view(), name="feed-atom"),
+        path("feeds/<str:post_type>/rss.xml", feeds.RssPostFeedView.as_view(), name="feed-rss"),
+        path("sitemap.xml", feeds.SitemapIndexView.as_view(), name="sitemap"),
+        path("sitemap-<int:segment>.xml", feeds.SitemapSegmentView.as_view(), name="sitemap-segment"),
+        path("attachments/<int:pk>/", media.AttachmentFileView.as_view(), name="attachment-file"),
+        path("attachments/<int:pk>/<slug:rendition>/", media.AttachmentFileView.as_view(), name="attachment-rendition"),
+        path("api/", include((router.urls, "api"))),
+    ]
+
+
+urlpatterns = build_urlpatterns(settings.BLOG_ASYNC_ROUTES)